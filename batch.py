@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .cli import (
+    add_common_arguments,
+    analyze_repository,
+    build_github_client,
+    build_llm,
+    check_run_dir_options,
+    load_environment,
+    open_run_checkpoint,
+    report_metrics,
+)
+from .github_client import GitHubClient
+from .metrics import Metrics
+
+
+@dataclass
+class BatchResult:
+    repo_url: str
+    report_path: Optional[Path] = None
+    issue_count: int = 0
+    pain_point_count: int = 0
+    error: Optional[str] = None
+
+
+def read_repo_list(path: str) -> List[str]:
+    """Read repository URLs, one per line; blank lines and ``#`` comments are skipped."""
+    repos: List[str] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            repos.append(line)
+    return repos
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="demandlens-batch",
+        description="Analyze many GitHub repositories with shared connections and LLM limits.",
+    )
+    parser.add_argument("repos_file", help="Text file with one GitHub repository URL per line.")
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="reports",
+        help="Directory for per-repository reports and summary.md (default: reports).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=2,
+        help="Number of repositories processed at the same time (default: 2).",
+    )
+    add_common_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def render_summary(results: List[BatchResult]) -> str:
+    lines = [
+        "## Batch Summary",
+        "",
+        "| Repository | Analyzed Issues | Pain Points | Report |",
+        "| --- | --- | --- | --- |",
+    ]
+    for r in results:
+        if r.error:
+            lines.append(f"| {r.repo_url} | - | - | failed: {r.error} |")
+        else:
+            report = r.report_path.name if r.report_path else "-"
+            lines.append(
+                f"| {r.repo_url} | {r.issue_count} | {r.pain_point_count} | [{report}]({report}) |"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    load_environment()
+
+    repo_urls = read_repo_list(args.repos_file)
+    if not repo_urls:
+        print(f"[demandlens] No repositories listed in {args.repos_file}.", file=sys.stderr)
+        return 1
+
+    # One metrics registry for the whole batch; stage times add up across repositories.
+    metrics = Metrics()
+    try:
+        check_run_dir_options(args)
+        # One session for every repository; --workers caps in-flight GitHub
+        # requests across all of them.
+        client = build_github_client(args, max_concurrent_requests=args.workers, metrics=metrics)
+    except ValueError as exc:
+        print(f"[demandlens] {exc}", file=sys.stderr)
+        return 1
+    llm_client, scheduler = build_llm(args, metrics=metrics)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def run(repo_url: str) -> BatchResult:
+        result = BatchResult(repo_url=repo_url)
+        try:
+            owner, repo = GitHubClient.parse_repo_url(repo_url)
+            result.report_path = output_dir / f"{owner}__{repo}.md"
+            checkpoint = None
+            if args.run_dir:
+                # One checkpoint per repository; LLM responses share <run-dir>/llm.
+                checkpoint = open_run_checkpoint(args, Path(args.run_dir) / f"{owner}__{repo}", repo_url)
+            result.issue_count, analysis = analyze_repository(
+                args,
+                client,
+                llm_client,
+                scheduler,
+                repo_url,
+                result.report_path,
+                log_prefix=f"[demandlens] {owner}/{repo}:",
+                metrics=metrics,
+                # Concurrent repositories would fight over one terminal.
+                show_progress=False,
+                delta_path=Path(args.delta) / f"{owner}__{repo}.json" if args.delta else None,
+                checkpoint=checkpoint,
+            )
+            result.pain_point_count = len(analysis.pain_points)
+        except Exception as exc:
+            result.error = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+            print(f"[demandlens] {repo_url} failed: {result.error}", file=sys.stderr)
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            results = list(pool.map(run, repo_urls))
+    finally:
+        report_metrics(args, metrics)
+
+    summary_path = output_dir / "summary.md"
+    summary_path.write_text(render_summary(results), encoding="utf-8")
+    failed = sum(1 for r in results if r.error)
+    print(
+        f"[demandlens] Analyzed {len(results) - failed}/{len(results)} repositories; "
+        f"summary written to {summary_path}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
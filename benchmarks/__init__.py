@@ -0,0 +1,5 @@
+"""
+Benchmarks for DemandLens hot paths.
+
+Run a module with ``python -m demandlens.benchmarks.<name>``.
+"""
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..demand_extractor import is_analysis_payload
+from ..json_extract import extract_json_object, extract_json_object_from_stream
+from .synthetic import make_analysis
+
+
+def legacy_extract(markdown_text: str) -> Dict[str, Any]:
+    """The regex-based extractor this module replaced, kept for comparison."""
+    code_block_match = re.search(
+        r"```json\s*(\{.*?\})\s*```", markdown_text, flags=re.DOTALL | re.IGNORECASE
+    )
+    raw = code_block_match.group(1) if code_block_match else markdown_text
+    try:
+        return json.loads(raw)
+    except Exception:
+        brace_match = re.search(r"(\{.*\})", markdown_text, flags=re.DOTALL)
+        if brace_match:
+            return json.loads(brace_match.group(1))
+        raise ValueError("No JSON object found in LLM output.")
+
+
+def pain_points_for(megabytes: float) -> int:
+    per_point = len(json.dumps(make_analysis(100), indent=2)) / 100
+    return max(1, int(megabytes * 1024 * 1024 / per_point))
+
+
+def outputs(megabytes: float) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """The expected analysis and well-formed or awkward LLM outputs of about ``megabytes``."""
+    analysis = make_analysis(pain_points_for(megabytes))
+    body = json.dumps(analysis, indent=2)
+    return analysis, {
+        "fenced": f"Here is the analysis.\n\n```json\n{body}\n```\n",
+        # No closing fence, and prose with braces on both sides.
+        "unfenced": f"Result {{see below}}:\n{body}\nNotes: use {{placeholders}} sparingly.",
+        # A truncated first attempt followed by the real answer.
+        "retry": f"```json\n{body[: len(body) // 2]}\n```\nSorry, again:\n```json\n{body}\n```",
+    }
+
+
+def time_call(func: Callable[[], Any], repeat: int, expected: Dict[str, Any]) -> Tuple[float, bool]:
+    """Best wall time of ``func`` and whether it returned ``expected``."""
+    best, ok = float("inf"), True
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            ok = func() == expected
+        except ValueError:
+            ok = False
+        best = min(best, time.perf_counter() - start)
+    return best, ok
+
+
+def measure(megabytes: float, repeat: int, delta_chars: int) -> None:
+    expected, texts = outputs(megabytes)
+    for name, text in texts.items():
+        size = len(text) / (1024 * 1024)
+        deltas: List[str] = [text[i : i + delta_chars] for i in range(0, len(text), delta_chars)]
+        results = {
+            "regex": time_call(lambda: legacy_extract(text), repeat, expected),
+            "scanner": time_call(
+                lambda: extract_json_object(text, is_analysis_payload), repeat, expected
+            ),
+            "stream": time_call(
+                lambda: extract_json_object_from_stream(deltas, is_analysis_payload),
+                repeat,
+                expected,
+            ),
+        }
+        print(
+            f"{size:6.1f} MiB {name:<9} | "
+            + " | ".join(
+                f"{k} {v * 1000:8.1f} ms ({size / v:6.1f} MiB/s){'' if ok else ' WRONG'}"
+                for k, (v, ok) in results.items()
+            )
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput of JSON extraction from LLM output.")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 16], help="Output sizes in MiB.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--delta-chars",
+        type=int,
+        default=64,
+        help="Characters per streamed delta for the incremental parser (default: 64).",
+    )
+    args = parser.parse_args(argv)
+    for megabytes in args.sizes:
+        measure(megabytes, args.repeat, args.delta_chars)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
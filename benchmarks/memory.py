@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+
+from ..issue_parser import bulk_issues_to_text
+from .synthetic import make_issues
+
+
+def measure(count: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    issues = make_issues(count)
+    fetched, _ = tracemalloc.get_traced_memory()
+    texts = bulk_issues_to_text(issues)
+    converted, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del issues, texts
+
+    mib = 1024 * 1024
+    print(
+        f"{count:>7} issues | Issue records {fetched / mib:8.1f} MiB | "
+        f"+ IssueText {(converted - fetched) / mib:8.1f} MiB | peak {peak / mib:8.1f} MiB"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Peak memory of the Issue -> IssueText stage.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args(argv)
+    for size in args.sizes:
+        measure(size)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Dict, List
+
+from ..demand_extractor import DemandExtractor
+from ..issue_parser import bulk_issues_to_text
+from ..llm import LLMClient
+from ..metrics import Metrics
+from ..prompt import PROMPT_PREFIXES, SYSTEM_PROMPT
+from ..tokens import estimate_tokens
+from .stubs import StubOpenAIServer
+from .synthetic import make_analysis, make_issues
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run a chunked and a delta analysis against the stub OpenAI server and check that "
+            "every request starts with the system prompt and a fixed user-prompt prefix."
+        )
+    )
+    parser.add_argument("--issues", type=int, default=300, help="Synthetic issues to analyze (default: 300).")
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=20000,
+        help="Token budget per chunk, small enough to force map-reduce (default: 20000).",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM calls (default: 4).")
+    parser.add_argument(
+        "--cache-min-tokens",
+        type=int,
+        default=1024,
+        help="Shortest shared prefix the stub reports as cached, as OpenAI does (default: 1024).",
+    )
+    args = parser.parse_args(argv)
+
+    texts = bulk_issues_to_text(make_issues(args.issues))
+    metrics = Metrics()
+    with StubOpenAIServer(cache_min_tokens=args.cache_min_tokens) as openai_stub:
+        llm = LLMClient(api_key="benchmark", base_url=openai_stub.base_url, metrics=metrics)
+        extractor = DemandExtractor(llm, chunk_tokens=args.chunk_tokens, max_workers=args.workers)
+        extractor.analyze(texts)
+        # Delta runs folding a few changed issues (one call), then enough for several chunks
+        # (map-reduce), into a previous analysis.
+        extractor.analyze(texts[:5], previous=make_analysis(10))
+        extractor.analyze(texts[-40:], previous=make_analysis(10))
+        requests = openai_stub.messages
+
+    failures: List[str] = []
+    calls: Dict[str, int] = {}
+    for index, messages in enumerate(requests, 1):
+        system = messages[0].get("content") if messages else None
+        user = messages[-1].get("content") or "" if messages else ""
+        if system != SYSTEM_PROMPT:
+            failures.append(f"request {index} has a different system prompt")
+        kind = next((k for k, prefix in PROMPT_PREFIXES.items() if user.startswith(prefix)), None)
+        if kind is None:
+            failures.append(f"request {index} does not start with a known user-prompt prefix")
+            continue
+        calls[kind] = calls.get(kind, 0) + 1
+
+    system_tokens = estimate_tokens(SYSTEM_PROMPT)
+    for kind, prefix in PROMPT_PREFIXES.items():
+        print(
+            f"{kind:<14} | {calls.get(kind, 0):4d} calls | "
+            f"fixed prefix {system_tokens + estimate_tokens(prefix):6d} tokens"
+        )
+    prompt_tokens = metrics.count("llm_prompt_tokens_total")
+    cached_tokens = metrics.count("llm_cached_prompt_tokens_total")
+    share = cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    print(f"prompt tokens  | {prompt_tokens:g} total, {cached_tokens:g} reported cached ({share:.1%})")
+
+    for message in failures:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..demand_extractor import ISSUE_SEPARATOR, DemandExtractor
+from ..github_client import GitHubClient
+from ..issue_parser import bulk_issues_to_text
+from ..llm import LLMClient
+from ..prompt import build_user_prompt
+from ..reporter import render_markdown_report
+from .stubs import StubGitHubServer, StubOpenAIServer
+from .synthetic import make_llm_output
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+STAGES = [
+    "list_issues",
+    "fetch_comments_for_issues",
+    "bulk_issues_to_text",
+    "build_user_prompt",
+    "extract_json_from_markdown",
+    "render_markdown_report",
+    "analyze",
+]
+
+
+def peak_rss_mib() -> Optional[float]:
+    """Peak resident set size of this process so far, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def timed(size: int, stage: str, items: int, func: Callable[[], Any]) -> tuple[Any, Dict[str, Any]]:
+    gc.collect()
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    result = {
+        "size": size,
+        "stage": stage,
+        "seconds": round(seconds, 4),
+        "items": items,
+        "items_per_second": round(items / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+    return value, result
+
+
+def run_size(size: int, workers: int, chunk_tokens: int, stages: List[str]) -> List[Dict[str, Any]]:
+    """Run every selected stage for one corpus size and return one row per stage."""
+    results: List[Dict[str, Any]] = []
+
+    def record(stage: str, items: int, func: Callable[[], Any]) -> Any:
+        if stage not in stages:
+            return func() if stage in ("list_issues", "bulk_issues_to_text") else None
+        value, row = timed(size, stage, items, func)
+        results.append(row)
+        print(format_row(row), flush=True)
+        return value
+
+    with StubGitHubServer(size) as github:
+        client = GitHubClient(base_url=github.base_url, max_workers=workers)
+        issues = record(
+            "list_issues",
+            size,
+            lambda: client.list_issues("owner", "repo", state="all", max_issues=size),
+        )
+        record(
+            "fetch_comments_for_issues",
+            size,
+            lambda: client.fetch_comments_for_issues("owner", "repo", issues, max_workers=workers),
+        )
+
+    texts = record("bulk_issues_to_text", size, lambda: bulk_issues_to_text(issues))
+    record(
+        "build_user_prompt",
+        size,
+        lambda: build_user_prompt(ISSUE_SEPARATOR.join(t.to_prompt_block() for t in texts)),
+    )
+
+    # LLM output and report scale with the corpus: one pain point per ten issues.
+    pain_points = max(10, size // 10)
+    llm_output = make_llm_output(pain_points)
+    data = record(
+        "extract_json_from_markdown",
+        pain_points,
+        lambda: LLMClient.extract_json_from_markdown(llm_output),
+    )
+    if data is not None:
+        analysis = DemandExtractor._to_analysis(data)
+        record(
+            "render_markdown_report",
+            pain_points,
+            lambda: render_markdown_report("https://github.com/owner/repo", size, analysis),
+        )
+
+    if "analyze" in stages:
+        with StubOpenAIServer() as openai_stub:
+            llm = LLMClient(api_key="benchmark", base_url=openai_stub.base_url)
+            extractor = DemandExtractor(llm, chunk_tokens=chunk_tokens, max_workers=workers)
+            record("analyze", size, lambda: extractor.analyze(texts))
+
+    return results
+
+
+def format_row(row: Dict[str, Any]) -> str:
+    rate = row["items_per_second"]
+    rss = row["peak_rss_mib"]
+    return (
+        f"{row['size']:>7} | {row['stage']:<27} | {row['seconds']:>9.3f} s | "
+        f"{(f'{rate:,.0f}' if rate is not None else '-'):>12} items/s | "
+        f"peak RSS {(f'{rss:.1f}' if rss is not None else 'n/a'):>8} MiB"
+    )
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Return a message for every stage whose throughput fell more than ``tolerance`` below baseline."""
+    previous = {(r["size"], r["stage"]): r for r in baseline}
+    regressions: List[str] = []
+    for row in results:
+        old = previous.get((row["size"], row["stage"]))
+        if not old or not old.get("items_per_second") or not row["items_per_second"]:
+            continue
+        ratio = row["items_per_second"] / old["items_per_second"]
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{row['stage']} @ {row['size']}: {row['items_per_second']:,.0f} items/s "
+                f"vs {old['items_per_second']:,.0f} baseline ({ratio:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Time each pipeline stage against local stub GitHub and OpenAI servers."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--workers", type=int, default=8, help="HTTP and LLM workers (default: 8).")
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=100_000,
+        help="Chunk budget for the analyze stage (default: 100000).",
+    )
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file.")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="Compare against a previous --json file and exit 1 on regressions.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed throughput drop versus --baseline (default: 0.25).",
+    )
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.workers, args.chunk_tokens, args.stages))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+# Console scripts and the module whose ``main`` they run.
+ENTRY_POINTS = {
+    "demandlens": "demandlens.cli",
+    "demandlens-batch": "demandlens.batch",
+}
+# Dependencies that must only be imported by the stage that uses them.
+DEFERRED_MODULES = ("openai", "httpx", "requests", "urllib3", "tqdm", "dotenv")
+DEFAULT_BUDGET_MS = 300.0
+
+# Runs in a fresh interpreter: import the entry point and print its --help,
+# timing everything after interpreter startup.
+_PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+from {module} import main
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        main(["--help"])
+    except SystemExit:
+        pass
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module: str) -> Dict[str, Any]:
+    """Time ``<module>.main(["--help"])`` in a new interpreter."""
+    code = _PROBE.format(module=module, deferred=DEFERRED_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def slowest_imports(module: str, top: int) -> List[Tuple[int, str]]:
+    """The ``top`` largest self import times (microseconds) reported by ``-X importtime``."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    rows: List[Tuple[int, str]] = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:") :].split("|")
+        rows.append((int(own), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure `--help` startup of the console scripts against an import-time budget."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point; the best counts (default: 5).")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Maximum time from import to --help output (default: {DEFAULT_BUDGET_MS:.0f}).",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        help="Also list the N slowest modules imported by each entry point (default: 0).",
+    )
+    args = parser.parse_args(argv)
+
+    failures: List[str] = []
+    for script, module in ENTRY_POINTS.items():
+        runs = [probe(module) for _ in range(max(1, args.repeat))]
+        best = min(run["seconds"] for run in runs) * 1000
+        loaded = sorted({name for run in runs for name in run["loaded"]})
+        print(f"{script + ' --help':<24} | {best:7.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if best > args.budget_ms:
+            failures.append(f"{script} --help took {best:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        if loaded:
+            failures.append(f"{script} --help imported {', '.join(loaded)}")
+        for own, name in slowest_imports(module, args.top):
+            print(f"    {own / 1000:7.1f} ms  {name}")
+
+    for message in failures:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .synthetic import comment_payload, issue_payload, make_llm_output
+
+
+class _StubServer:
+    """A threaded localhost HTTP server run in the background for the duration of a ``with`` block."""
+
+    def __init__(self, handler: Callable[[BaseHTTPRequestHandler], Tuple[int, Dict[str, str], bytes]]) -> None:
+        respond = handler
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this,
+            # keep-alive clients stall on delayed ACKs.
+            disable_nagle_algorithm = True
+
+            def _serve(self) -> None:
+                status, headers, body = respond(self)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _serve
+            do_POST = _serve
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "_StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _json(status: int, data: Any, headers: Dict[str, str] | None = None) -> Tuple[int, Dict[str, str], bytes]:
+    return status, {"Content-Type": "application/json", **(headers or {})}, json.dumps(data).encode("utf-8")
+
+
+class StubGitHubServer(_StubServer):
+    """
+    Serves ``issue_count`` synthetic issues on the REST endpoints used by
+    ``GitHubClient``. Issue ``n`` has ``n % 4`` comments, so a quarter of
+    the threads exercise the zero-comment shortcut. Responses carry an
+    ``ETag``; a matching ``If-None-Match`` is answered with an empty 304,
+    counted in ``not_modified``.
+    """
+
+    _COMMENTS = re.compile(r"^/repos/[^/]+/[^/]+/issues/(\d+)/comments$")
+    _ISSUES = re.compile(r"^/repos/[^/]+/[^/]+/issues$")
+
+    def __init__(self, issue_count: int, body_chars: int = 2000) -> None:
+        self.issue_count = issue_count
+        self.body_chars = body_chars
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        super().__init__(self._respond)
+
+    def _respond(self, request: BaseHTTPRequestHandler) -> Tuple[int, Dict[str, str], bytes]:
+        with self._lock:
+            self.requests += 1
+        status, headers, body = self._resource(request)
+        if status != 200:
+            return status, headers, body
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.not_modified += 1
+            return 304, {"ETag": etag}, b""
+        return status, {**headers, "ETag": etag}, body
+
+    def _resource(self, request: BaseHTTPRequestHandler) -> Tuple[int, Dict[str, str], bytes]:
+        url = urlparse(request.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+
+        if self._ISSUES.match(url.path):
+            # Newest first, like sort=created&direction=desc.
+            first = self.issue_count - (page - 1) * per_page
+            numbers = range(first, max(0, first - per_page), -1)
+            return _json(200, [issue_payload(n, n % 4, self.body_chars) for n in numbers])
+
+        match = self._COMMENTS.match(url.path)
+        if match:
+            number = int(match.group(1))
+            return _json(200, [comment_payload(number, i) for i in range(number % 4)])
+
+        return _json(404, {"message": "Not Found"})
+
+
+class StubOpenAIServer(_StubServer):
+    """
+    An OpenAI-compatible ``/v1/chat/completions`` endpoint that always
+    answers with the same Markdown-wrapped analysis.
+
+    Every request's messages are kept in ``messages``. Prompt caching is
+    simulated like OpenAI's: the longest prefix shared with an earlier
+    request counts as cached in steps of ``cache_step_tokens`` once it
+    reaches ``cache_min_tokens`` (four characters per token). The next
+    ``failures`` requests are answered with a 503 and ``Retry-After: 0``.
+    With ``stream: true`` the reply is sent as server-sent events of
+    ``stream_chunk_chars`` characters each, followed by a usage chunk
+    when ``stream_options.include_usage`` asks for one.
+    """
+
+    def __init__(
+        self,
+        pain_points: int = 10,
+        cache_min_tokens: int = 1024,
+        cache_step_tokens: int = 128,
+        stream_chunk_chars: int = 64,
+    ) -> None:
+        self.reply = make_llm_output(pain_points)
+        self.cache_min_tokens = cache_min_tokens
+        self.cache_step_tokens = cache_step_tokens
+        self.stream_chunk_chars = stream_chunk_chars
+        self.messages: List[List[Dict[str, Any]]] = []
+        self.failures = 0
+        self._prompts: List[str] = []
+        self._lock = threading.Lock()
+        super().__init__(self._respond)
+
+    def _cached_tokens(self, prompt: str) -> int:
+        shared = max((len(os.path.commonprefix([prompt, seen])) for seen in self._prompts), default=0)
+        tokens = shared // 4
+        if tokens < self.cache_min_tokens:
+            return 0
+        return tokens - tokens % self.cache_step_tokens
+
+    @property
+    def base_url(self) -> str:
+        return super().base_url + "/v1"
+
+    def _respond(self, request: BaseHTTPRequestHandler) -> Tuple[int, Dict[str, str], bytes]:
+        with self._lock:
+            self.requests += 1
+        length = int(request.headers.get("Content-Length") or 0)
+        payload = json.loads(request.rfile.read(length) or b"{}")
+        if not request.path.endswith("/chat/completions"):
+            return _json(404, {"error": {"message": "Not Found"}})
+        with self._lock:
+            fail, self.failures = self.failures > 0, max(0, self.failures - 1)
+        if fail:
+            return _json(503, {"error": {"message": "Service Unavailable"}}, {"Retry-After": "0"})
+        messages = payload.get("messages", [])
+        prompt = "".join(f"{m.get('role')}\n{m.get('content') or ''}\n" for m in messages)
+        with self._lock:
+            cached_tokens = self._cached_tokens(prompt)
+            self.messages.append(messages)
+            self._prompts.append(prompt)
+        prompt_chars = sum(len(m.get("content") or "") for m in messages)
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(self.reply) // 4,
+            "total_tokens": (prompt_chars + len(self.reply)) // 4,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+        model = payload.get("model", "stub")
+        if payload.get("stream"):
+            include_usage = (payload.get("stream_options") or {}).get("include_usage")
+            return self._stream(model, usage if include_usage else None)
+        return _json(
+            200,
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": self.reply},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _stream(self, model: str, usage: Dict[str, Any] | None) -> Tuple[int, Dict[str, str], bytes]:
+        def chunk(choices: List[Dict[str, Any]], **extra: Any) -> str:
+            data = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        step = max(1, self.stream_chunk_chars)
+        events = [chunk([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])]
+        events.extend(
+            chunk([{"index": 0, "delta": {"content": self.reply[i : i + step]}, "finish_reason": None}])
+            for i in range(0, len(self.reply), step)
+        )
+        events.append(chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        if usage is not None:
+            events.append(chunk([], usage=usage))
+        events.append("data: [DONE]\n\n")
+        return 200, {"Content-Type": "text/event-stream"}, "".join(events).encode("utf-8")
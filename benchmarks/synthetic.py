@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+from ..github_client import Issue, IssueComment
+
+
+def make_issues(count: int, comments_per_issue: int = 5, body_chars: int = 2000) -> List[Issue]:
+    """Build ``count`` synthetic issues with distinct bodies and comment threads."""
+    issues: List[Issue] = []
+    for n in range(1, count + 1):
+        comments = [
+            IssueComment(
+                id=n * 1000 + i,
+                body=f"comment {i} on issue {n}: " + "x" * (body_chars // 4),
+                user=f"user{i}",
+            )
+            for i in range(comments_per_issue)
+        ]
+        issues.append(
+            Issue(
+                id=n,
+                number=n,
+                title=f"Synthetic issue {n}",
+                body=f"issue {n} body: " + "y" * body_chars,
+                state="open",
+                html_url=f"https://github.com/owner/repo/issues/{n}",
+                user=f"author{n % 97}",
+                comments=comments,
+            )
+        )
+    return issues
+
+
+def issue_payload(number: int, comment_count: int, body_chars: int = 2000) -> Dict[str, Any]:
+    """A GitHub REST ``/issues`` list item."""
+    return {
+        "id": number,
+        "number": number,
+        "title": f"Synthetic issue {number}",
+        "body": f"issue {number} body: " + "y" * body_chars,
+        "state": "open",
+        "html_url": f"https://github.com/owner/repo/issues/{number}",
+        "user": {"login": f"author{number % 97}"},
+        "comments": comment_count,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-02T00:00:00Z",
+    }
+
+
+def comment_payload(number: int, index: int, body_chars: int = 500) -> Dict[str, Any]:
+    """A GitHub REST issue comment."""
+    return {
+        "id": number * 1000 + index,
+        "body": f"comment {index} on issue {number}: " + "x" * body_chars,
+        "user": {"login": f"user{index}"},
+        "issue_url": f"https://api.github.com/repos/owner/repo/issues/{number}",
+    }
+
+
+def make_analysis(pain_points: int) -> Dict[str, Any]:
+    """A ``DemandAnalysis``-shaped dict with the given number of pain points."""
+    features = max(1, pain_points // 2)
+    return {
+        "overview": [f"Users struggle with area {i}" for i in range(4)],
+        "pain_points": [
+            {
+                "id": f"pp_{i}",
+                "summary": f"Pain point {i} with a \"quoted\" {{brace}} in it",
+                "evidence_issue_numbers": [i, i + 1, i + 2],
+                "why_it_matters": "Because it blocks many users. " * 3,
+                "priority": ["High", "Medium", "Low"][i % 3],
+            }
+            for i in range(1, pain_points + 1)
+        ],
+        "merged_feature_requests": [
+            {
+                "id": f"fr_{i}",
+                "summary": f"Feature {i}",
+                "related_pain_point_ids": [f"pp_{i}", f"pp_{i + 1}"],
+                "priority": "Medium",
+                "notes": "Implementation notes. " * 2,
+            }
+            for i in range(1, features + 1)
+        ],
+        "roadmap": [
+            {
+                "step": i,
+                "title": f"Phase {i}",
+                "related_feature_request_ids": [f"fr_{i}"],
+                "rationale": "Ordered by impact.",
+            }
+            for i in range(1, min(features, 10) + 1)
+        ],
+    }
+
+
+def make_llm_output(pain_points: int) -> str:
+    """Markdown-wrapped JSON as an LLM would return it, with surrounding prose."""
+    body = json.dumps(make_analysis(pain_points), ensure_ascii=False, indent=2)
+    return f"Here is the analysis you asked for.\n\n```json\n{body}\n```\n\nLet me know if you need more."
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .fileio import atomic_write
+
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache root (``$XDG_CACHE_HOME/demandlens``)."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "demandlens"
+
+
+class DiskCache:
+    """
+    Size-bounded on-disk key/value store for JSON-serializable values.
+
+    Each entry lives in its own file; the file's mtime doubles as the
+    last-access time so least-recently-used eviction survives restarts.
+    Safe to share between threads of one process. Writes are not flushed
+    to disk unless ``durable`` is set: a lost entry only costs a refetch.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        durable: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.durable = durable
+        self._lock = threading.Lock()
+        # key -> size in bytes, ordered from least to most recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> None:
+        found = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                value = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        # Readers never see partial entries; a torn or empty file reads as a miss.
+        atomic_write(path, data, durable=self.durable)
+
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+
+class LayeredCache:
+    """
+    Several ``DiskCache`` stores used as one: reads try each in order and
+    copy a hit into the layers before it, writes go to every layer.
+
+    Lets a run directory keep its own copy of every LLM response while the
+    shared per-user cache is still consulted and filled.
+    """
+
+    def __init__(self, layers: Sequence[DiskCache]) -> None:
+        self.layers = list(layers)
+
+    def get(self, key: str) -> Optional[Any]:
+        for index, layer in enumerate(self.layers):
+            value = layer.get(key)
+            if value is not None:
+                for earlier in self.layers[:index]:
+                    earlier.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        for layer in self.layers:
+            layer.set(key, value)
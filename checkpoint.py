@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import DiskCache
+from .corpus import issue_from_record, issue_to_record
+from .fileio import atomic_write
+from .github_client import GitHubClient, Issue, IssueFilter
+
+
+# Run directory layout:
+#   run.json           what the run fetches; checked on --resume
+#   listing.json       next listing page to request and whether listing finished
+#   pages/00001.json   issues of one listing page, rewritten once their comments are in
+#   llm/               every LLM response of the run, keyed like the LLM cache
+RUN_FILE = "run.json"
+LISTING_FILE = "listing.json"
+PAGES_DIR = "pages"
+LLM_DIR = "llm"
+RUN_VERSION = 1
+
+
+def _write_json(path: Path, value: Any) -> None:
+    atomic_write(path, json.dumps(value, ensure_ascii=False))
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def llm_checkpoint_cache(run_dir: str | os.PathLike[str]) -> DiskCache:
+    """The run's store of LLM responses; never evicts and survives a power cut."""
+    return DiskCache(Path(run_dir) / LLM_DIR, max_bytes=sys.maxsize, durable=True)
+
+
+class RunCheckpoint:
+    """
+    Durable progress of one repository's fetch in a run directory.
+
+    ``run`` describes what is being fetched (repository, state, filters,
+    ...). A new checkpoint refuses a directory that already holds a run
+    unless ``resume`` is set, and a resumed one must describe the same run.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], run: Dict[str, Any], resume: bool = False) -> None:
+        self.directory = Path(directory)
+        self.run = {"version": RUN_VERSION, **run}
+        existing = _read_json(self.directory / RUN_FILE)
+        if existing is not None:
+            if not resume:
+                raise ValueError(
+                    f"{self.directory} already holds a run; pass --resume to continue it "
+                    "or choose another --run-dir."
+                )
+            if existing != self.run:
+                changed = sorted(k for k in {**existing, **self.run} if existing.get(k) != self.run.get(k))
+                raise ValueError(
+                    f"{self.directory} holds a different run (differs in: {', '.join(changed)})."
+                )
+        else:
+            _write_json(self.directory / RUN_FILE, self.run)
+        listing = _read_json(self.directory / LISTING_FILE) or {}
+        self.next_page: int = listing.get("next_page", 1)
+        self.listed: bool = listing.get("complete", False)
+
+    def _page_path(self, index: int) -> Path:
+        return self.directory / PAGES_DIR / f"{index:05d}.json"
+
+    def load_pages(self) -> Dict[int, Tuple[List[Issue], bool]]:
+        """Saved pages by index: their issues and whether comments were fetched."""
+        pages: Dict[int, Tuple[List[Issue], bool]] = {}
+        for path in sorted((self.directory / PAGES_DIR).glob("*.json")):
+            data = _read_json(path) or {}
+            issues = [issue_from_record(r) for r in data.get("issues") or []]
+            pages[int(path.stem)] = (issues, bool(data.get("comments_done")))
+        return pages
+
+    def save_page(self, index: int, issues: List[Issue], comments_done: bool) -> None:
+        _write_json(
+            self._page_path(index),
+            {"issues": [issue_to_record(i) for i in issues], "comments_done": comments_done},
+        )
+
+    def save_listing(self, next_page: int, complete: bool) -> None:
+        self.next_page, self.listed = next_page, complete
+        _write_json(self.directory / LISTING_FILE, {"next_page": next_page, "complete": complete})
+
+
+def fetch_issues_checkpointed(
+    client: GitHubClient,
+    checkpoint: RunCheckpoint,
+    owner: str,
+    repo: str,
+    state: str = "open",
+    max_issues: Optional[int] = 100,
+    issue_filter: Optional[IssueFilter] = None,
+    on_listed: Optional[Callable[[int], Any]] = None,
+    on_comments: Optional[Callable[[int], Any]] = None,
+) -> List[Issue]:
+    """
+    List issues and fetch their comments, checkpointing after every page.
+
+    Each listing page is saved as soon as it arrives and saved again once
+    the comments of its issues are fetched, so a resumed run repeats at
+    most one page of work. The REST listing resumes at the next page;
+    search and GraphQL listings start over and only issues not saved yet
+    are kept. ``on_listed`` / ``on_comments`` receive progress counts.
+    """
+    pages = checkpoint.load_pages()
+    seen = {issue.number for issues, _ in pages.values() for issue in issues}
+    if on_listed is not None and seen:
+        on_listed(len(seen))
+
+    if not checkpoint.listed:
+        index = max(pages, default=0)
+
+        def listed_page(number: int) -> None:
+            # Called once the page's issues are saved, so the cursor never runs ahead of them.
+            checkpoint.save_listing(number + 1, complete=False)
+
+        for page in client.iter_issue_pages(
+            owner,
+            repo,
+            state=state,
+            max_issues=max_issues,
+            issue_filter=issue_filter,
+            start_page=checkpoint.next_page,
+            on_page=listed_page,
+        ):
+            new = [issue for issue in page if issue.number not in seen]
+            if max_issues is not None:
+                new = new[: max(0, max_issues - len(seen))]
+            if new:
+                index += 1
+                seen.update(issue.number for issue in new)
+                checkpoint.save_page(index, new, comments_done=False)
+                pages[index] = (new, False)
+                if on_listed is not None:
+                    on_listed(len(new))
+            if max_issues is not None and len(seen) >= max_issues:
+                break
+        checkpoint.save_listing(checkpoint.next_page, complete=True)
+
+    issues: List[Issue] = []
+    for index in sorted(pages):
+        page_issues, done = pages[index]
+        if not done:
+            page_issues = client.fetch_comments_for_issues(owner, repo, page_issues, progress=on_comments)
+            checkpoint.save_page(index, page_issues, comments_done=True)
+        elif on_comments is not None:
+            on_comments(len(page_issues))
+        issues.extend(page_issues)
+    return issues
@@ -1,26 +1,50 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import os
 import sys
+from contextlib import nullcontext
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
+from typing import Any, Iterable, Optional
 
-from dotenv import load_dotenv
-from tqdm import tqdm
-
-from .demand_extractor import DemandExtractor
-from .github_client import GitHubClient
-from .issue_parser import bulk_issues_to_text
+from .cache import DEFAULT_CACHE_MAX_BYTES, DiskCache, LayeredCache, default_cache_dir
+from .checkpoint import RunCheckpoint, fetch_issues_checkpointed, llm_checkpoint_cache
+from .corpus import CorpusReader, CorpusWriter
+from .dedup import deduplicate_issues
+from .delta import AnalysisState, changed_issues, load_analysis_state, save_analysis_state
+from .demand_extractor import DemandAnalysis, DemandExtractor
+from .github_client import GitHubClient, IssueFilter
+from .github_graphql import GitHubGraphQLClient
+from .issue_parser import (
+    NOISE_RULES,
+    IssueText,
+    NoiseFilter,
+    NoiseStats,
+    bulk_issues_to_text,
+    filter_issue_texts,
+    issue_to_text,
+)
+from .issue_store import IssueStore, sync_repository
 from .llm import LLMClient
-from .reporter import render_markdown_report
+from .llm_scheduler import LLMScheduler
+from .metrics import Metrics
+from .pipeline import stream_issue_texts
+from .reporter import StreamingReportWriter, render_markdown_report
 
 
-def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(
-        prog="demandlens",
-        description="Extract real user demands from GitHub Issues using LLMs.",
-    )
-    parser.add_argument("repo_url", help="GitHub repository URL, e.g. https://github.com/owner/repo")
+def _iso_date(value: str) -> str:
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an ISO 8601 date or time, got {value!r}")
+    return value
+
+
+def add_fetch_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the options that control fetching issues from GitHub."""
     parser.add_argument(
         "--max-issues",
         type=int,
@@ -29,62 +53,804 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     parser.add_argument(
         "--state",
-        choices=["open", "closed, all"],
+        choices=["open", "closed", "all"],
         default="open",
         help="Issue state to fetch from GitHub (default: open).",
     )
+    parser.add_argument(
+        "--label",
+        dest="labels",
+        action="append",
+        default=[],
+        metavar="LABEL",
+        help="Only fetch issues carrying this label; repeat to require several (default: any).",
+    )
+    parser.add_argument(
+        "--created-after",
+        type=_iso_date,
+        default=None,
+        metavar="DATE",
+        help="Only fetch issues created on or after this ISO 8601 date or time.",
+    )
+    parser.add_argument(
+        "--created-before",
+        type=_iso_date,
+        default=None,
+        metavar="DATE",
+        help="Only fetch issues created on or before this ISO 8601 date or time.",
+    )
+    parser.add_argument(
+        "--updated-after",
+        type=_iso_date,
+        default=None,
+        metavar="DATE",
+        help="Only fetch issues updated on or after this ISO 8601 date or time.",
+    )
+    parser.add_argument(
+        "--updated-before",
+        type=_iso_date,
+        default=None,
+        metavar="DATE",
+        help="Only fetch issues updated on or before this ISO 8601 date or time.",
+    )
+    parser.add_argument(
+        "--exclude-author",
+        dest="exclude_authors",
+        action="append",
+        default=[],
+        metavar="LOGIN",
+        help="Skip issues opened by this account (e.g. 'app/dependabot'); repeatable.",
+    )
+    parser.add_argument(
+        "--min-reactions",
+        type=int,
+        default=0,
+        help="Only fetch issues with at least this many reactions (default: 0).",
+    )
+    parser.add_argument(
+        "--min-comments",
+        type=int,
+        default=0,
+        help="Only fetch issues with at least this many comments (default: 0).",
+    )
+    parser.add_argument(
+        "--api",
+        choices=["rest", "graphql"],
+        default="rest",
+        help=(
+            "GitHub API used to fetch issues (default: rest). 'graphql' fetches issues "
+            "together with their first comments in batched queries and needs GITHUB_TOKEN."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of concurrent GitHub requests when fetching comments (default: 4).",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Disable the conditional-request (ETag) cache for GitHub API responses.",
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=None,
+        help=(
+            "SQLite file used as a local issue store. When set, only issues and comments "
+            "updated since the previous run are fetched from GitHub."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Overlap fetching and analysis: with --chunk-tokens, each chunk is sent to the "
+            "LLM as soon as enough issues have been fetched."
+        ),
+    )
+    parser.add_argument(
+        "--export-corpus",
+        type=str,
+        default=None,
+        help=(
+            "Also save the fetched issues to this corpus directory so they can be "
+            "re-analyzed later with 'demandlens analyze --corpus'."
+        ),
+    )
+
+
+def _noise_rules(value: str) -> tuple[str, ...]:
+    rules = tuple(r.strip() for r in value.split(",") if r.strip())
+    unknown = sorted(set(rules) - set(NOISE_RULES))
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown rule(s) {', '.join(unknown)}; choose from {', '.join(NOISE_RULES)}"
+        )
+    return rules
+
+
+def add_analysis_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the options that control caching and LLM analysis."""
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for on-disk caches (default: $XDG_CACHE_HOME/demandlens).",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+        help="Size cap for each on-disk cache (GitHub responses, LLM responses) in MB (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing cached responses for identical prompts.",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=None,
+        help="LLM model name (default: value configured in llm.py).",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=None,
+        help=(
+            "Token budget for issue text per LLM call. Larger issue sets are split into "
+            "chunks analyzed in parallel and then merged (default: single call)."
+        ),
+    )
+    parser.add_argument(
+        "--max-issue-tokens",
+        type=int,
+        default=None,
+        help=(
+            "Token cap per issue. Longer issues keep their title, the head of the body "
+            "and the most recent comments that fit (default: no cap)."
+        ),
+    )
+    parser.add_argument(
+        "--llm-workers",
+        type=int,
+        default=4,
+        help="Number of concurrent LLM calls in chunked analysis (default: 4).",
+    )
+    parser.add_argument(
+        "--filter-noise",
+        nargs="?",
+        type=_noise_rules,
+        const=NOISE_RULES,
+        default=None,
+        metavar="RULES",
+        help=(
+            "Strip text that costs tokens without describing a need before analysis. "
+            f"Optional comma-separated subset of: {', '.join(NOISE_RULES)} (default: all rules)."
+        ),
+    )
+    parser.add_argument(
+        "--filter-processes",
+        type=int,
+        default=None,
+        help=(
+            "Worker processes for --filter-noise (default: all CPUs for 2000+ fetched "
+            "issues, otherwise in-process)."
+        ),
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help=(
+            "Cluster near-duplicate issues locally (MinHash/LSH) and send one representative "
+            "per cluster to the LLM."
+        ),
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=0.7,
+        help="Estimated Jaccard similarity at which issues count as duplicates (default: 0.7).",
+    )
+    parser.add_argument(
+        "--llm-rpm",
+        type=float,
+        default=None,
+        help="Requests-per-minute limit for LLM calls (default: unlimited).",
+    )
+    parser.add_argument(
+        "--llm-tpm",
+        type=float,
+        default=None,
+        help="Prompt tokens-per-minute limit for LLM calls (default: unlimited).",
+    )
+    parser.add_argument(
+        "--stream-llm",
+        action="store_true",
+        help=(
+            "Stream the LLM call that produces the final result and write each report "
+            "section to the output file as soon as it is complete."
+        ),
+    )
+    parser.add_argument(
+        "--delta",
+        type=str,
+        default=None,
+        metavar="STATE",
+        help=(
+            "Incremental analysis: load the previous result from this state file, send only "
+            "new or changed issues to the LLM to update it (keeping pp_*/fr_* IDs), and save "
+            "the new state back. The first run analyzes everything. For demandlens-batch, a "
+            "directory with one state file per repository."
+        ),
+    )
+    parser.add_argument(
+        "--run-dir",
+        type=str,
+        default=None,
+        help=(
+            "Checkpoint the run in this directory: every fetched page of issues, its comments "
+            "and every LLM response are saved as they arrive, so an interrupted run can be "
+            "continued with --resume. Not combinable with --stream or --store."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the run checkpointed in --run-dir from its last completed unit.",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        type=str,
+        default=None,
+        help=(
+            "Write run metrics (stage timings, GitHub and LLM request counters) to this file: "
+            "a Prometheus textfile for *.prom, JSON otherwise."
+        ),
+    )
+
+
+def add_common_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the fetch and analysis options shared by every entry point."""
+    add_fetch_arguments(parser)
+    add_analysis_arguments(parser)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="demandlens",
+        description="Extract real user demands from GitHub Issues using LLMs.",
+    )
+    parser.add_argument("repo_url", help="GitHub repository URL, e.g. https://github.com/owner/repo")
     parser.add_argument(
         "--output",
         type=str,
         default="requirements.md",
         help="Output Markdown file path (default: requirements.md).",
     )
+    add_common_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def _cache_paths(args: argparse.Namespace) -> tuple[Path, int]:
+    cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir()
+    return cache_dir, args.cache_max_mb * 1024 * 1024
+
+
+def _progress(
+    enabled: bool,
+    desc: str,
+    total: Optional[int] = None,
+    unit: str = "issue",
+    iterable: Optional[Iterable[Any]] = None,
+) -> Any:
+    from tqdm import tqdm
+
+    # disable=None lets tqdm hide the bar when stderr is not a terminal.
+    return tqdm(
+        iterable,
+        desc=desc,
+        total=total,
+        unit=unit,
+        disable=None if enabled else True,
+        leave=False,
+    )
+
+
+def check_run_dir_options(args: argparse.Namespace) -> None:
+    """Reject --run-dir/--resume combinations that cannot be checkpointed."""
+    if args.resume and not args.run_dir:
+        raise ValueError("--resume requires --run-dir.")
+    if args.run_dir and (getattr(args, "stream", False) or getattr(args, "store", None)):
+        raise ValueError("--run-dir cannot be combined with --stream or --store.")
+
+
+def open_run_checkpoint(args: argparse.Namespace, directory: Path, repo_url: str) -> RunCheckpoint:
+    """The checkpoint of fetching ``repo_url`` with the options in ``args``."""
+    owner, repo = GitHubClient.parse_repo_url(repo_url)
+    issue_filter = build_issue_filter(args)
+    return RunCheckpoint(
+        directory,
+        {
+            "repo": f"{owner}/{repo}",
+            "state": args.state,
+            "max_issues": args.max_issues,
+            "api": args.api,
+            "filter": dataclasses.asdict(issue_filter) if issue_filter is not None else None,
+        },
+        resume=args.resume,
+    )
+
+
+def build_issue_filter(args: argparse.Namespace) -> Optional[IssueFilter]:
+    """The server-side issue filter requested on the command line, if any."""
+    issue_filter = IssueFilter(
+        labels=tuple(args.labels),
+        created_after=args.created_after,
+        created_before=args.created_before,
+        updated_after=args.updated_after,
+        updated_before=args.updated_before,
+        exclude_authors=tuple(args.exclude_authors),
+        min_reactions=args.min_reactions,
+        min_comments=args.min_comments,
+    )
+    return None if issue_filter == IssueFilter() else issue_filter
+
+
+def build_github_client(
+    args: argparse.Namespace,
+    max_concurrent_requests: int | None = None,
+    metrics: Optional[Metrics] = None,
+) -> GitHubClient:
+    """Create the GitHub client selected by ``args`` (raises ValueError on bad options)."""
+    # GITHUB_TOKENS (comma- or whitespace-separated) adds tokens to rotate across.
+    tokens = [os.getenv("GITHUB_TOKEN") or ""] + os.getenv("GITHUB_TOKENS", "").replace(",", " ").split()
+    tokens = list(dict.fromkeys(t for t in tokens if t))
+    github_token = tokens[0] if tokens else None
+    if args.api == "graphql" and not github_token:
+        raise ValueError("--api graphql requires GITHUB_TOKEN or GITHUB_TOKENS to be set.")
+    cache_dir, cache_max_bytes = _cache_paths(args)
+    http_cache = None
+    if not args.no_http_cache:
+        http_cache = DiskCache(cache_dir / "http", max_bytes=cache_max_bytes)
+    client_cls = GitHubGraphQLClient if args.api == "graphql" else GitHubClient
+    return client_cls(
+        token=github_token,
+        max_workers=args.workers,
+        cache=http_cache,
+        max_concurrent_requests=max_concurrent_requests,
+        metrics=metrics,
+        tokens=tokens or None,
+    )
+
+
+def build_llm(
+    args: argparse.Namespace,
+    metrics: Optional[Metrics] = None,
+) -> tuple[LLMClient, LLMScheduler]:
+    cache_dir, cache_max_bytes = _cache_paths(args)
+    model_name = args.model or "gpt-4.1-mini"
+    llm_cache: Optional[DiskCache | LayeredCache] = None
+    if not args.no_llm_cache:
+        llm_cache = DiskCache(cache_dir / "llm", max_bytes=cache_max_bytes)
+    if args.run_dir:
+        # The run keeps its own responses even with --no-llm-cache: that is its LLM checkpoint.
+        run_cache = llm_checkpoint_cache(args.run_dir)
+        llm_cache = LayeredCache([run_cache, llm_cache]) if llm_cache is not None else run_cache
+    llm_client = LLMClient(model=model_name, cache=llm_cache, metrics=metrics, max_retries=0)
+    scheduler = LLMScheduler(
+        llm_client,
+        max_concurrency=args.llm_workers,
+        requests_per_minute=args.llm_rpm,
+        tokens_per_minute=args.llm_tpm,
+    )
+    return llm_client, scheduler
+
+
+def analyze_repository(
+    args: argparse.Namespace,
+    client: GitHubClient,
+    llm_client: LLMClient,
+    scheduler: LLMScheduler,
+    repo_url: str,
+    output_path: Path,
+    log_prefix: str = "[demandlens]",
+    metrics: Optional[Metrics] = None,
+    show_progress: bool = True,
+    delta_path: Optional[Path] = None,
+    checkpoint: Optional[RunCheckpoint] = None,
+) -> tuple[int, DemandAnalysis]:
+    """
+    Fetch, analyze and report on one repository.
+
+    Returns the number of analyzed issues and the analysis. The caller owns
+    ``client`` and ``scheduler`` so they can be shared across repositories.
+    Stage wall times are added to ``metrics`` when given. With a
+    ``checkpoint`` the fetch is saved page by page and resumed from it.
+    """
+    metrics = metrics or Metrics()
+    owner, repo = GitHubClient.parse_repo_url(repo_url)
+    issue_filter = build_issue_filter(args)
+    corpus = CorpusWriter(args.export_corpus, repo_url) if args.export_corpus else None
+
+    with corpus if corpus is not None else nullcontext():
+        if args.store:
+            store = IssueStore(args.store)
+            try:
+                print(f"{log_prefix} Syncing {owner}/{repo} into {args.store} ...")
+                with metrics.stage("fetch"):
+                    fetched = sync_repository(
+                        client,
+                        store,
+                        owner,
+                        repo,
+                        state=args.state,
+                        max_issues=args.max_issues,
+                        issue_filter=issue_filter,
+                    )
+                    issues = store.load_issues(
+                        owner,
+                        repo,
+                        state=args.state,
+                        max_issues=args.max_issues,
+                        issue_filter=issue_filter,
+                    )
+                print(f"{log_prefix} Fetched {fetched} new or updated issues.")
+            finally:
+                store.close()
+            print(f"{log_prefix} Retrieved {len(issues)} issues (after PR filtering).")
+            issue_texts: Iterable[IssueText] = bulk_issues_to_text(issues)
+        elif args.stream:
+            print(f"{log_prefix} Streaming issues from {owner}/{repo} into the LLM ...")
+            issues = []
+            # Fetching overlaps the LLM calls, so its time is part of "analyze".
+            issue_texts = _progress(
+                show_progress,
+                "Fetching issues",
+                args.max_issues,
+                iterable=stream_issue_texts(
+                    client,
+                    owner,
+                    repo,
+                    state=args.state,
+                    max_issues=args.max_issues,
+                    sink=corpus.write if corpus is not None else None,
+                    issue_filter=issue_filter,
+                ),
+            )
+        elif checkpoint is not None:
+            print(f"{log_prefix} Fetching issues from {owner}/{repo} (checkpointed in {checkpoint.directory}) ...")
+            with metrics.stage("fetch"):
+                with _progress(show_progress, "Listing issues", args.max_issues) as listed, _progress(
+                    show_progress, "Fetching comments", args.max_issues
+                ) as commented:
+                    issues = fetch_issues_checkpointed(
+                        client,
+                        checkpoint,
+                        owner,
+                        repo,
+                        state=args.state,
+                        max_issues=args.max_issues,
+                        issue_filter=issue_filter,
+                        on_listed=listed.update,
+                        on_comments=commented.update,
+                    )
+            print(f"{log_prefix} Retrieved {len(issues)} issues (after PR filtering).")
+            issue_texts = bulk_issues_to_text(issues)
+        else:
+            print(f"{log_prefix} Fetching issues from {owner}/{repo} ...")
+            with metrics.stage("fetch"):
+                issues = []
+                with _progress(show_progress, "Listing issues", args.max_issues) as bar:
+                    for page in client.iter_issue_pages(
+                        owner,
+                        repo,
+                        state=args.state,
+                        max_issues=args.max_issues,
+                        issue_filter=issue_filter,
+                    ):
+                        issues.extend(page)
+                        bar.update(len(page))
+                with _progress(show_progress, "Fetching comments", len(issues)) as bar:
+                    issues = client.fetch_comments_for_issues(
+                        owner, repo, issues, progress=bar.update
+                    )
+            print(f"{log_prefix} Retrieved {len(issues)} issues (after PR filtering).")
+            issue_texts = bulk_issues_to_text(issues)
+        if corpus is not None:
+            for issue in issues:
+                corpus.write(issue)
+
+        return analyze_issue_texts(
+            args,
+            llm_client,
+            scheduler,
+            issue_texts,
+            repo_url,
+            output_path,
+            log_prefix,
+            metrics=metrics,
+            show_progress=show_progress,
+            delta_path=delta_path,
+        )
+
+
+def load_delta_state(path: Path, repo_url: str) -> Optional[AnalysisState]:
+    """Load the --delta state file, refusing one written for another repository."""
+    state = load_analysis_state(path)
+    if state is not None and state.repo_url and repo_url:
+        if GitHubClient.parse_repo_url(state.repo_url) != GitHubClient.parse_repo_url(repo_url):
+            raise ValueError(f"{path} holds the analysis of {state.repo_url}, not {repo_url}.")
+    return state
+
+
+def analyze_issue_texts(
+    args: argparse.Namespace,
+    llm_client: LLMClient,
+    scheduler: LLMScheduler,
+    issue_texts: Iterable[IssueText],
+    repo_url: str,
+    output_path: Path,
+    log_prefix: str = "[demandlens]",
+    metrics: Optional[Metrics] = None,
+    show_progress: bool = True,
+    delta_path: Optional[Path] = None,
+) -> tuple[int, DemandAnalysis]:
+    """
+    Run deduplication, LLM analysis and report rendering over ``issue_texts``.
+
+    With ``delta_path``, only issues that are new or changed since the
+    state saved there are sent to the LLM, and the state is updated.
+    """
+    metrics = metrics or Metrics()
+    extractor = DemandExtractor(
+        llm_client,
+        chunk_tokens=args.chunk_tokens,
+        max_issue_tokens=args.max_issue_tokens,
+        scheduler=scheduler,
+    )
+
+    noise_stats: Optional[NoiseStats] = None
+    if args.filter_noise:
+        noise_stats = NoiseStats()
+        # Lazy, so a --stream run still overlaps fetching with analysis.
+        issue_texts = filter_issue_texts(
+            issue_texts,
+            NoiseFilter(args.filter_noise),
+            noise_stats,
+            processes=args.filter_processes,
+        )
+
+    analyzed_count: int | None = None
+    if args.dedup:
+        # Clustering needs the whole set, so a --stream run stops overlapping here.
+        all_texts = list(issue_texts)
+        with metrics.stage("dedup"):
+            issue_texts = deduplicate_issues(all_texts, threshold=args.dedup_threshold)
+        analyzed_count = len(all_texts)
+        print(
+            f"{log_prefix} Deduplicated {len(all_texts)} issues into "
+            f"{len(issue_texts)} representatives."
+        )
+
+    state: Optional[AnalysisState] = None
+    # Fingerprints of every issue in this run, changed or not.
+    seen: dict[int, str] = {}
+    if delta_path is not None:
+        state = load_delta_state(delta_path, repo_url)
+        if state is not None:
+            print(f"{log_prefix} Updating the analysis saved in {delta_path} ({state.updated_at}).")
+        issue_texts = changed_issues(issue_texts, state.fingerprints if state else {}, seen)
+
+    def issue_count() -> int:
+        if analyzed_count is not None:
+            return analyzed_count
+        # In delta mode the packer only sees the changed issues.
+        return len(seen) if delta_path is not None else extractor.last_pack.issue_count
+
+    writer: Optional[StreamingReportWriter] = None
+    on_section = None
+    if args.stream_llm:
+        writer = StreamingReportWriter(
+            output_path,
+            repo_url,
+            # Packing has consumed every issue by the time the final call streams.
+            issue_count=issue_count,
+        )
+
+        def on_section(name: str, items: list) -> None:
+            for section in writer.add_section(name, items):
+                bar.write(f"{log_prefix} Section '{section}' written to {output_path}")
+
+    print(f"{log_prefix} Calling LLM to analyze user demands (this may take a while)...")
+    with metrics.stage("analyze"), _progress(show_progress, "LLM calls", unit="call") as bar:
+        extractor.progress = bar.update
+        analysis = extractor.analyze(
+            issue_texts,
+            on_section=on_section,
+            previous=state.analysis if state is not None else None,
+        )
+    pack = extractor.last_pack
+    print(
+        f"{log_prefix} Prompted ~{pack.total_tokens} tokens from {pack.issue_count} issues "
+        f"in {pack.chunk_count} chunk(s); dropped ~{pack.dropped_tokens} tokens from "
+        f"{pack.truncated_issues} truncated issue(s)."
+    )
+    if noise_stats is not None:
+        report_noise(noise_stats, metrics, log_prefix)
+    if delta_path is not None:
+        fingerprints = {**(state.fingerprints if state else {}), **seen}
+        save_analysis_state(delta_path, AnalysisState(repo_url, analysis.raw_json, fingerprints))
+        metrics.inc("delta_issues_skipped_total", len(seen) - pack.issue_count)
+        print(
+            f"{log_prefix} Delta: {pack.issue_count} of {len(seen)} issues new or changed; "
+            f"state saved to {delta_path}"
+        )
+
+    analyzed_count = issue_count()
+    with metrics.stage("report"):
+        if writer is not None:
+            writer.finish(analysis, analyzed_count)
+        else:
+            output_md = render_markdown_report(repo_url, analyzed_count, analysis)
+            output_path.write_text(output_md, encoding="utf-8")
+    print(f"{log_prefix} Requirements report written to {output_path}")
+    return analyzed_count, analysis
+
+
+def report_noise(stats: NoiseStats, metrics: Metrics, log_prefix: str = "[demandlens]") -> None:
+    """Print and record what --filter-noise removed."""
+    metrics.inc("noise_bytes_saved_total", stats.bytes_saved)
+    metrics.inc("noise_tokens_saved_total", stats.tokens_saved)
+    metrics.inc("noise_comments_dropped_total", stats.comments_dropped)
+    share = stats.tokens_saved / stats.tokens_before if stats.tokens_before else 0.0
+    print(
+        f"{log_prefix} Noise filter removed {stats.bytes_saved / 1024:.1f} KiB "
+        f"(~{stats.tokens_saved} tokens, {share:.0%}) and {stats.comments_dropped} comment(s) "
+        f"from {stats.issues} issues."
+    )
+
+
+def report_metrics(args: argparse.Namespace, metrics: Metrics) -> None:
+    """Print the run digest and export metrics if --metrics-out was given."""
+    print(f"[demandlens] Run metrics: {metrics.format_summary()}")
+    if args.metrics_out:
+        metrics.write(args.metrics_out)
+        print(f"[demandlens] Metrics written to {args.metrics_out}")
+
+
+def parse_analyze_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="demandlens analyze",
+        description="Analyze a previously exported issue corpus without contacting GitHub.",
+    )
     parser.add_argument(
-        "--model",
+        "--corpus",
         type=str,
+        required=True,
+        help="Corpus directory written by --export-corpus.",
+    )
+    parser.add_argument(
+        "--max-issues",
+        type=int,
         default=None,
-        help="LLM model name (default: value configured in llm.py).",
+        help="Only analyze the first N issues of the corpus (default: all).",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="requirements.md",
+        help="Output Markdown file path (default: requirements.md).",
     )
+    add_analysis_arguments(parser)
     return parser.parse_args(argv)
 
 
-def main(argv: list[str] | None = None) -> int:
-    # Load environment variables from .env if present
+def load_environment() -> None:
+    """Load environment variables from .env if present."""
+    # Imported here, after argument parsing, to keep ``--help`` fast.
+    from dotenv import load_dotenv
+
     load_dotenv()
 
-    args = parse_args(argv)
 
+def analyze_main(argv: list[str] | None = None) -> int:
+    """Entry point for ``demandlens analyze --corpus PATH``."""
+    args = parse_analyze_args(argv)
+    load_environment()
     try:
-        owner, repo = GitHubClient.parse_repo_url(args.repo_url)
+        reader = CorpusReader(args.corpus)
+    except (OSError, ValueError) as exc:
+        print(f"[demandlens] Cannot open corpus: {exc}", file=sys.stderr)
+        return 1
+    try:
+        if args.delta:
+            load_delta_state(Path(args.delta), reader.repo_url)
+        check_run_dir_options(args)
+        if args.run_dir:
+            # Only LLM responses are checkpointed; the corpus is already on disk.
+            RunCheckpoint(
+                args.run_dir,
+                {"corpus": str(Path(args.corpus).resolve()), "max_issues": args.max_issues},
+                resume=args.resume,
+            )
     except ValueError as exc:
-        print(f"[demandlens] Invalid repo URL: {exc}", file=sys.stderr)
+        print(f"[demandlens] {exc}", file=sys.stderr)
         return 1
 
-    github_token = os.getenv("GITHUB_TOKEN")
-    client = GitHubClient(token=github_token)
+    print(f"[demandlens] Reading {len(reader)} issues from corpus {args.corpus} ...")
+    # Issues are read from disk one at a time as the analysis consumes them.
+    issue_texts = (issue_to_text(issue) for issue in islice(reader, args.max_issues))
+    metrics = Metrics()
+    llm_client, scheduler = build_llm(args, metrics=metrics)
+    try:
+        analyze_issue_texts(
+            args,
+            llm_client,
+            scheduler,
+            issue_texts,
+            reader.repo_url,
+            Path(args.output),
+            metrics=metrics,
+            delta_path=Path(args.delta) if args.delta else None,
+        )
+    finally:
+        report_metrics(args, metrics)
+    return 0
+
 
-    print(f"[demandlens] Fetching issues from {owner}/{repo} ...")
-    issues = client.list_issues(owner, repo, state=args.state, max_issues=args.max_issues)
-    issues = client.fetch_comments_for_issues(owner, repo, issues)
-    print(f"[demandlens] Retrieved {len(issues)} issues (after PR filtering).")
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "analyze":
+        return analyze_main(argv[1:])
 
-    issue_texts = bulk_issues_to_text(issues)
+    args = parse_args(argv)
+    load_environment()
 
-    model_name = args.model or "gpt-4.1-mini"
-    llm_client = LLMClient(model=model_name)
-    extractor = DemandExtractor(llm_client)
+    try:
+        GitHubClient.parse_repo_url(args.repo_url)
+    except ValueError as exc:
+        print(f"[demandlens] Invalid repo URL: {exc}", file=sys.stderr)
+        return 1
 
-    print("[demandlens] Calling LLM to analyze user demands (this may take a while)...")
-    analysis = extractor.analyze(issue_texts)
+    try:
+        if args.delta:
+            # Fail before fetching anything if the state file is unusable.
+            load_delta_state(Path(args.delta), args.repo_url)
+        check_run_dir_options(args)
+        checkpoint = open_run_checkpoint(args, Path(args.run_dir), args.repo_url) if args.run_dir else None
+    except ValueError as exc:
+        print(f"[demandlens] {exc}", file=sys.stderr)
+        return 1
 
-    output_md = render_markdown_report(args.repo_url, len(issue_texts), analysis)
-    output_path = Path(args.output)
-    output_path.write_text(output_md, encoding="utf-8")
-    print(f"[demandlens] Requirements report written to {output_path}")
+    metrics = Metrics()
+    try:
+        client = build_github_client(args, metrics=metrics)
+    except ValueError as exc:
+        print(f"[demandlens] {exc}", file=sys.stderr)
+        return 1
+    llm_client, scheduler = build_llm(args, metrics=metrics)
+
+    try:
+        analyze_repository(
+            args,
+            client,
+            llm_client,
+            scheduler,
+            args.repo_url,
+            Path(args.output),
+            metrics=metrics,
+            delta_path=Path(args.delta) if args.delta else None,
+            checkpoint=checkpoint,
+        )
+    finally:
+        report_metrics(args, metrics)
 
     return 0
 
 
 if __name__ == "__main__":  # pragma: no cover
     raise SystemExit(main())
-
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .fileio import atomic_write
+from .github_client import Issue, IssueComment
+
+
+# Corpus layout (a directory):
+#   issues.jsonl  one compact JSON object per issue, comments inline
+#   issues.idx    little-endian uint64 byte offset of each line in issues.jsonl
+#   meta.json     repository URL, issue count and export time
+DATA_FILE = "issues.jsonl"
+INDEX_FILE = "issues.idx"
+META_FILE = "meta.json"
+_OFFSET = struct.Struct("<Q")
+
+
+def issue_to_record(issue: Issue) -> Dict[str, Any]:
+    """JSON-serializable form of ``issue``, comments inline."""
+    return dataclasses.asdict(issue)
+
+
+def issue_from_record(record: Dict[str, Any]) -> Issue:
+    """Inverse of ``issue_to_record``; consumes ``record``."""
+    comments = [IssueComment(**c) for c in record.pop("comments", None) or []]
+    return Issue(comments=comments, **record)
+
+
+class CorpusWriter:
+    """
+    Append issues to an on-disk corpus one at a time.
+
+    Only the offsets are kept in memory, so exports of any size stream
+    straight to disk. The index and metadata are written on ``close``;
+    a corpus without ``meta.json`` is incomplete and rejected by readers.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], repo_url: str = "") -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.repo_url = repo_url
+        meta = self.path / META_FILE
+        if meta.exists():
+            meta.unlink()
+        self._data = (self.path / DATA_FILE).open("wb")
+        self._offsets: List[int] = []
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._data.close()
+
+    @property
+    def count(self) -> int:
+        return len(self._offsets)
+
+    def write(self, issue: Issue) -> None:
+        self._offsets.append(self._data.tell())
+        line = json.dumps(issue_to_record(issue), ensure_ascii=False, separators=(",", ":"))
+        self._data.write(line.encode("utf-8") + b"\n")
+
+    def close(self) -> None:
+        if self._data.closed:
+            return
+        self._data.close()
+        atomic_write(
+            self.path / INDEX_FILE,
+            b"".join(_OFFSET.pack(o) for o in self._offsets),
+        )
+        meta = {
+            "repo_url": self.repo_url,
+            "issue_count": len(self._offsets),
+            "exported_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        atomic_write(self.path / META_FILE, json.dumps(meta, indent=2).encode("utf-8"))
+
+
+def write_corpus(path: str | os.PathLike[str], issues: Iterable[Issue], repo_url: str = "") -> int:
+    """Export ``issues`` to a corpus directory and return how many were written."""
+    with CorpusWriter(path, repo_url) as writer:
+        for issue in issues:
+            writer.write(issue)
+        return writer.count
+
+
+class CorpusReader:
+    """
+    Read issues back from a corpus directory.
+
+    Iteration streams one line at a time, so memory stays flat regardless
+    of corpus size; ``reader[i]`` seeks through the memory-mapped index.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        meta_path = self.path / META_FILE
+        if not meta_path.exists():
+            raise ValueError(f"{self.path} is not a complete DemandLens corpus (missing {META_FILE}).")
+        self.meta: Dict[str, Any] = json.loads(meta_path.read_text(encoding="utf-8"))
+        self._index: Optional[mmap.mmap] = None
+        self._data: Optional[mmap.mmap] = None
+
+    @property
+    def repo_url(self) -> str:
+        return self.meta.get("repo_url") or ""
+
+    def __len__(self) -> int:
+        return (self.path / INDEX_FILE).stat().st_size // _OFFSET.size
+
+    def __iter__(self) -> Iterator[Issue]:
+        with (self.path / DATA_FILE).open("rb") as fh:
+            for line in fh:
+                yield issue_from_record(json.loads(line))
+
+    @staticmethod
+    def _map(path: Path) -> Optional[mmap.mmap]:
+        if path.stat().st_size == 0:
+            return None
+        with path.open("rb") as fh:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, index: int) -> Issue:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(index)
+        if self._index is None:
+            self._index = self._map(self.path / INDEX_FILE)
+            self._data = self._map(self.path / DATA_FILE)
+        assert self._index is not None and self._data is not None
+        (start,) = _OFFSET.unpack_from(self._index, index * _OFFSET.size)
+        end = self._data.find(b"\n", start)
+        return issue_from_record(json.loads(self._data[start:end]))
+
+    def close(self) -> None:
+        for mapped in (self._index, self._data):
+            if mapped is not None:
+                mapped.close()
+        self._index = self._data = None
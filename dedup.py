@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+from .issue_parser import IssueText
+
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_MASK64 = (1 << 64) - 1
+# Odd 64-bit constant used to spread densified values apart.
+_ROTATION = 0x9E3779B97F4A7C15
+
+DEFAULT_NUM_BINS = 64
+DEFAULT_BANDS = 16
+# Word shingle size and per-issue cap (the head of very long bodies is enough).
+SHINGLE_SIZE = 3
+MAX_SHINGLES = 2000
+
+
+def _shingle_hashes(text: str) -> List[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [
+            " ".join(words[i : i + SHINGLE_SIZE])
+            for i in range(min(len(words) - SHINGLE_SIZE + 1, MAX_SHINGLES))
+        ]
+    return [
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+        for g in set(grams)
+    ]
+
+
+def minhash_signature(text: str, num_bins: int = DEFAULT_NUM_BINS) -> List[int]:
+    """
+    One-permutation MinHash signature of ``text``'s word shingles.
+
+    Each shingle hash falls into one of ``num_bins`` bins and each bin keeps
+    its minimum, so a signature costs a single pass over the shingles.
+    Empty bins are filled from the next non-empty bin (rotation
+    densification) so short texts still compare correctly.
+    """
+    sig: List[int | None] = [None] * num_bins
+    for h in _shingle_hashes(text):
+        b, v = h % num_bins, h // num_bins
+        cur = sig[b]
+        if cur is None or v < cur:
+            sig[b] = v
+    if all(v is None for v in sig):
+        return [_MASK64] * num_bins
+
+    filled: List[int] = [0] * num_bins
+    for i in range(num_bins):
+        j, dist = i, 0
+        while sig[j] is None:
+            j = (j + 1) % num_bins
+            dist += 1
+        filled[i] = (sig[j] + dist * _ROTATION) & _MASK64  # type: ignore[operator]
+    return filled
+
+
+def _similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def _issue_text_for_matching(issue: IssueText) -> str:
+    return f"{issue.title}\n{issue.body}"
+
+
+def deduplicate_issues(
+    issues: Sequence[IssueText],
+    threshold: float = 0.7,
+    num_bins: int = DEFAULT_NUM_BINS,
+    bands: int = DEFAULT_BANDS,
+) -> List[IssueText]:
+    """
+    Collapse near-duplicate issues into one representative per cluster.
+
+    Issues are compared on title and body with MinHash + LSH banding;
+    candidate pairs whose estimated Jaccard similarity reaches
+    ``threshold`` are merged (transitively). The representative of a
+    cluster is the issue with the most comments (lowest number on ties)
+    and lists the other members in ``duplicates``. Input order is kept.
+    """
+    if len(issues) < 2:
+        return list(issues)
+
+    rows = max(1, num_bins // bands)
+    signatures = [minhash_signature(_issue_text_for_matching(i), num_bins) for i in issues]
+
+    parent = list(range(len(issues)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for band in range(bands):
+        buckets: Dict[tuple, List[int]] = defaultdict(list)
+        for idx, sig in enumerate(signatures):
+            buckets[tuple(sig[band * rows : (band + 1) * rows])].append(idx)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for pos, other in enumerate(members[1:], start=1):
+                # Compare against earlier bucket members; huge buckets only
+                # check their neighbour to stay close to linear.
+                earlier = members[:pos] if len(members) <= 64 else [members[pos - 1]]
+                for first in earlier:
+                    ra, rb = find(first), find(other)
+                    if ra == rb:
+                        break
+                    if _similarity(signatures[first], signatures[other]) >= threshold:
+                        parent[rb] = ra
+                        break
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for idx in range(len(issues)):
+        clusters[find(idx)].append(idx)
+
+    representatives: Dict[int, IssueText] = {}
+    for members in clusters.values():
+        rep = max(members, key=lambda i: (len(issues[i].comments), -issues[i].number))
+        if len(members) == 1:
+            representatives[rep] = issues[rep]
+            continue
+        dupes = sorted(
+            {issues[i].number for i in members if i != rep}
+            | {n for i in members for n in issues[i].duplicates}
+        )
+        representatives[rep] = dataclasses.replace(issues[rep], duplicates=dupes)
+
+    return [representatives[i] for i in sorted(representatives)]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .fileio import atomic_write
+from .issue_parser import IssueText
+
+
+# Bumped when the layout of the state file changes incompatibly.
+STATE_VERSION = 1
+# Sections whose items carry stable ``id`` fields across delta runs.
+ID_SECTIONS = ("pain_points", "merged_feature_requests")
+
+
+@dataclass(slots=True)
+class AnalysisState:
+    """
+    What a delta run needs from the previous one.
+
+    ``analysis`` is the previous ``DemandAnalysis.raw_json`` and
+    ``fingerprints`` maps every issue it covers to a digest of the text
+    that was sent to the LLM.
+    """
+
+    repo_url: str
+    analysis: Dict[str, Any]
+    fingerprints: Dict[int, str] = field(default_factory=dict)
+    updated_at: str = ""
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": STATE_VERSION,
+                "repo_url": self.repo_url,
+                "updated_at": self.updated_at,
+                "fingerprints": {str(n): d for n, d in sorted(self.fingerprints.items())},
+                "analysis": self.analysis,
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def issue_fingerprint(issue: IssueText) -> str:
+    """Digest of the issue's prompt block; any edit, new comment or state change alters it."""
+    return hashlib.blake2b(issue.to_prompt_block().encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_analysis_state(path: str | os.PathLike[str]) -> Optional[AnalysisState]:
+    """Read a state file written by ``save_analysis_state``; None if it does not exist yet."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        raise ValueError(f"{path} is not a valid analysis state file: {exc}") from exc
+    if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+        raise ValueError(f"{path} is not a DemandLens analysis state file (version {STATE_VERSION}).")
+    return AnalysisState(
+        repo_url=data.get("repo_url") or "",
+        analysis=data.get("analysis") or {},
+        fingerprints={int(n): d for n, d in (data.get("fingerprints") or {}).items()},
+        updated_at=data.get("updated_at") or "",
+    )
+
+
+def save_analysis_state(path: str | os.PathLike[str], state: AnalysisState) -> None:
+    """Write ``state`` atomically, so an interrupted run keeps the previous file."""
+    state.updated_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    atomic_write(path, state.to_json())
+
+
+def changed_issues(
+    issues: Iterable[IssueText],
+    previous: Dict[int, str],
+    fingerprints: Dict[int, str],
+) -> Iterator[IssueText]:
+    """
+    Yield the issues that are new or differ from ``previous``, lazily.
+
+    The fingerprint of every issue seen, changed or not, is stored in
+    ``fingerprints`` so the caller can save it for the next run.
+    """
+    for issue in issues:
+        digest = issue_fingerprint(issue)
+        fingerprints[issue.number] = digest
+        if previous.get(issue.number) != digest:
+            yield issue
+
+
+def carry_over(previous: Dict[str, Any], updated: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Make sure an updated analysis still contains everything from ``previous``.
+
+    Items of ``ID_SECTIONS`` whose ID the model dropped are restored as
+    they were, and pain points keep their previous evidence. ``updated``
+    is modified in place and returned.
+    """
+    for section in ID_SECTIONS:
+        items = updated.get(section)
+        if not isinstance(items, list):
+            items = updated[section] = []
+        by_id = {item.get("id"): item for item in items if isinstance(item, dict)}
+        for old in previous.get(section) or []:
+            if not isinstance(old, dict) or not old.get("id"):
+                continue
+            current = by_id.get(old["id"])
+            if current is None:
+                items.append(old)
+                continue
+            old_evidence = old.get("evidence_issue_numbers")
+            if section == "pain_points" and isinstance(old_evidence, list):
+                evidence = current.get("evidence_issue_numbers")
+                merged: List[Any] = list(evidence) if isinstance(evidence, list) else []
+                merged.extend(n for n in old_evidence if n not in merged)
+                current["evidence_issue_numbers"] = merged
+    return updated
@@ -1,11 +1,35 @@
 from __future__ import annotations
 
+import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+from .delta import carry_over
 from .issue_parser import IssueText
+from .json_extract import SectionStreamParser
 from .llm import LLMClient
-from .prompt import SYSTEM_PROMPT, build_user_prompt
+from .llm_scheduler import LLMScheduler
+from .prompt import (
+    SYSTEM_PROMPT,
+    build_delta_prompt,
+    build_delta_reduce_prompt,
+    build_reduce_prompt,
+    build_user_prompt,
+)
+from .tokens import ChunkPacker, PackStats, pack_blocks
+
+
+ISSUE_SEPARATOR = "\n\n====================\n\n"
+
+# Top-level sections of the JSON the prompts ask for.
+ANALYSIS_SECTIONS = ("overview", "pain_points", "merged_feature_requests", "roadmap")
+
+
+def is_analysis_payload(data: Dict[str, Any]) -> bool:
+    """True if ``data`` has the shape of a (partial) analysis: known sections holding lists."""
+    present = [key for key in ANALYSIS_SECTIONS if key in data]
+    return bool(present) and all(isinstance(data[key], list) for key in present)
 
 
 @dataclass
@@ -17,26 +41,220 @@ class DemandAnalysis:
     raw_json: Dict[str, Any]
 
 
+SectionCallback = Callable[[str, List[Any]], None]
+
+
+def _expand_evidence(pain_points: List[Dict[str, Any]], duplicates: Dict[int, List[int]]) -> None:
+    """Add issues folded away by deduplication to each pain point's evidence, in place."""
+    if not duplicates:
+        return
+    for pp in pain_points:
+        if not isinstance(pp, dict):
+            continue
+        evidence = pp.get("evidence_issue_numbers")
+        if not isinstance(evidence, list):
+            continue
+        expanded = list(evidence)
+        for n in evidence:
+            expanded.extend(d for d in duplicates.get(n, []) if d not in expanded)
+        pp["evidence_issue_numbers"] = expanded
+
+
 class DemandExtractor:
     """
     Orchestrates the interaction with the LLM to extract user demands
     from a set of GitHub Issues.
     """
 
-    def __init__(self, llm_client: LLMClient) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        chunk_tokens: Optional[int] = None,
+        max_workers: int = 4,
+        max_issue_tokens: Optional[int] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        progress: Optional[Callable[[int], Any]] = None,
+    ) -> None:
         self._llm = llm_client
+        # When set, every chat call goes through the scheduler's rate limits
+        # and retries, and its concurrency replaces ``max_workers``.
+        self._scheduler = scheduler
+        # Token budget for the issue blocks of a single prompt. When the
+        # issues do not fit, analysis runs map-reduce: one call per chunk,
+        # then merge passes over the partial results.
+        self.chunk_tokens = chunk_tokens
+        self.max_workers = scheduler.max_concurrency if scheduler else max(1, max_workers)
+        # Per-issue token cap; longer issues are truncated by priority.
+        self.max_issue_tokens = max_issue_tokens
+        # Token accounting of the most recent analyze() call.
+        self.last_pack: Optional[PackStats] = None
+        # Called with 1 after every completed LLM call (e.g. ``tqdm.update``).
+        self.progress = progress
+
+    def analyze(
+        self,
+        issues: Iterable[IssueText],
+        on_section: Optional[SectionCallback] = None,
+        previous: Optional[Dict[str, Any]] = None,
+    ) -> DemandAnalysis:
+        """
+        Analyze issues, consuming ``issues`` lazily.
+
+        In chunked mode each chunk is sent to the LLM as soon as it fills,
+        so a generator that is still fetching issues overlaps with analysis.
+
+        With ``on_section``, the call that produces the final result (the
+        single chunk, or the last merge) is streamed, and the callback gets
+        ``(section, items)`` as soon as each top-level list of the JSON
+        (``overview``, ``pain_points``, ...) is complete.
 
-    def analyze(self, issues: Iterable[IssueText]) -> DemandAnalysis:
+        With ``previous`` (the ``raw_json`` of an earlier analysis),
+        ``issues`` should hold only new or changed issues: they are folded
+        into ``previous`` keeping its ``pp_*`` / ``fr_*`` IDs, and no LLM
+        call is made if there are none.
+        """
+        packer = ChunkPacker(self.chunk_tokens, self.max_issue_tokens)
+        self.last_pack = packer.stats
+        duplicates: Dict[int, List[int]] = {}
+        previous_json = json.dumps(previous, ensure_ascii=False) if previous is not None else None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = []
+            for issue in issues:
+                if issue.duplicates:
+                    duplicates[issue.number] = list(issue.duplicates)
+                chunk = packer.add(issue)
+                if chunk is not None:
+                    futures.append(pool.submit(self._analyze_blocks, chunk))
+            tail = packer.flush()
+            sections = self._section_sink(on_section, duplicates)
+            if not futures:
+                if previous_json is not None:
+                    if tail is None:
+                        return self._to_analysis(previous)
+                    data = self._analyze_blocks(tail, sections, previous_json)
+                    return self._to_analysis(carry_over(previous, data), duplicates)
+                return self._to_analysis(self._analyze_blocks(tail or [], sections), duplicates)
+            if tail is not None:
+                futures.append(pool.submit(self._analyze_blocks, tail))
+            partials = [f.result() for f in futures]
+
+        if previous_json is not None:
+            # Merge the new issues among themselves first, then into the previous result.
+            new_analysis = json.dumps(self._reduce(partials), ensure_ascii=False)
+            user_prompt = build_delta_reduce_prompt(previous_json, new_analysis)
+            data = self._complete(SYSTEM_PROMPT, user_prompt, sections)
+            return self._to_analysis(carry_over(previous, data), duplicates)
+        return self._to_analysis(self._reduce(partials, sections), duplicates)
+
+    @staticmethod
+    def _section_sink(
+        on_section: Optional[SectionCallback],
+        duplicates: Dict[int, List[int]],
+    ) -> Optional[SectionCallback]:
+        if on_section is None:
+            return None
+
+        def sink(name: str, items: List[Any]) -> None:
+            if name == "pain_points":
+                _expand_evidence(items, duplicates)
+            on_section(name, items)
+
+        return sink
+
+    def _map(self, func, items: List[Any]) -> List[Dict[str, Any]]:
+        workers = min(self.max_workers, len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+
+    def _complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        sections: Optional[SectionCallback] = None,
+    ) -> Dict[str, Any]:
+        """Run one LLM call and extract its analysis JSON, streaming if ``sections`` is set."""
+        if sections is None:
+            llm_output = self._chat(system_prompt, user_prompt)
+        else:
+            llm_output = self._chat_streamed(system_prompt, user_prompt, sections)
+        return self._llm.extract_json_from_markdown(llm_output, is_analysis_payload)
+
+    def _chat_streamed(self, system_prompt: str, user_prompt: str, sections: SectionCallback) -> str:
+        if self._scheduler is not None:
+            stream = self._scheduler.chat_stream(system_prompt, user_prompt)
+        else:
+            stream = self._llm.chat_stream(system_prompt, user_prompt)
+        parser = SectionStreamParser(ANALYSIS_SECTIONS)
+        parts: List[str] = []
+        for piece in stream:
+            parts.append(piece)
+            for name, items in parser.feed(piece):
+                sections(name, items)
+        if self.progress is not None:
+            self.progress(1)
+        return "".join(parts)
+
+    def _chat(self, system_prompt: str, user_prompt: str) -> str:
+        if self._scheduler is not None:
+            output = self._scheduler.chat(system_prompt, user_prompt)
+        else:
+            output = self._llm.chat(system_prompt, user_prompt)
+        if self.progress is not None:
+            self.progress(1)
+        return output
+
+    def _analyze_blocks(
+        self,
+        blocks: List[str],
+        sections: Optional[SectionCallback] = None,
+        previous_json: Optional[str] = None,
+    ) -> Dict[str, Any]:
         # Concatenate issues into a single long prompt block.
-        blocks = [issue.to_prompt_block() for issue in issues]
-        issue_blocks = "\n\n====================\n\n".join(blocks)
+        issue_blocks = ISSUE_SEPARATOR.join(blocks)
+        if previous_json is not None:
+            user_prompt = build_delta_prompt(previous_json, issue_blocks)
+        else:
+            user_prompt = build_user_prompt(issue_blocks)
+        return self._complete(SYSTEM_PROMPT, user_prompt, sections)
+
+    def _merge(
+        self,
+        partials: List[str],
+        sections: Optional[SectionCallback] = None,
+    ) -> Dict[str, Any]:
+        if len(partials) == 1:
+            return json.loads(partials[0])
+        user_prompt = build_reduce_prompt("\n\n".join(partials))
+        return self._complete(SYSTEM_PROMPT, user_prompt, sections)
 
-        user_prompt = build_user_prompt(issue_blocks)
-        llm_output = self._llm.chat(SYSTEM_PROMPT, user_prompt)
-        data = self._llm.extract_json_from_markdown(llm_output)
+    def _reduce(
+        self,
+        partials: List[Dict[str, Any]],
+        sections: Optional[SectionCallback] = None,
+    ) -> Dict[str, Any]:
+        """Merge partial analyses, in several rounds if they exceed one prompt."""
+        while len(partials) > 1:
+            encoded = [json.dumps(p, ensure_ascii=False) for p in partials]
+            # At least two per group so every round makes progress.
+            groups = pack_blocks(encoded, self.chunk_tokens or 0, min_size=2)
+            if len(groups) == 1:
+                # The last merge produces the final result.
+                return self._merge(groups[0], sections)
+            partials = self._map(self._merge, groups)
+        return partials[0]
 
+    @staticmethod
+    def _to_analysis(
+        data: Dict[str, Any],
+        duplicates: Optional[Dict[int, List[int]]] = None,
+    ) -> DemandAnalysis:
         overview = list(data.get("overview") or [])
         pain_points = list(data.get("pain_points") or [])
+        if duplicates:
+            _expand_evidence(pain_points, duplicates)
         merged_feature_requests = list(data.get("merged_feature_requests") or [])
         roadmap = list(data.get("roadmap") or [])
 
@@ -47,4 +265,3 @@ class DemandExtractor:
             roadmap=roadmap,
             raw_json=data,
         )
-
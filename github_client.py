@@ -1,23 +1,58 @@
 from __future__ import annotations
 
 import dataclasses
+import random
 import re
-from typing import Any, Dict, Iterable, List, Optional
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-import requests
+from .cache import DiskCache
+from .metrics import Metrics
+from .rate_limit import RateLimitGovernor
+
+if TYPE_CHECKING:
+    import requests
 
 
 GITHUB_API_BASE = "https://api.github.com"
 
+# GitHub asks clients hitting a secondary rate limit to wait at least a minute
+# (or the Retry-After value) and to back off exponentially on repeats.
+SECONDARY_RATE_LIMIT_WAIT = 60.0
+# Retries after rate limits, transient 5xx responses and connection errors.
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+# The search API returns at most this many results per query.
+SEARCH_RESULT_LIMIT = 1000
+
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class IssueComment:
     id: int
     body: str
     user: Optional[str] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Issue:
     id: int
     number: int
@@ -27,6 +62,135 @@ class Issue:
     html_url: str
     user: Optional[str] = None
     comments: List[IssueComment] | None = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    # Comment count reported by the issue listing; lets us skip or size comment fetches.
+    comment_count: Optional[int] = None
+    # Label names and total reactions, as listed; None when the source did not say.
+    labels: List[str] | None = None
+    reaction_count: Optional[int] = None
+
+
+def _rest_time(value: str) -> str:
+    # The REST ``since`` parameter wants a full timestamp.
+    return f"{value}T00:00:00Z" if len(value) == 10 else value
+
+
+def _search_time(value: str) -> str:
+    # Search qualifiers take ISO 8601 dates or times with a numeric offset.
+    return value[:-1] + "+00:00" if value.endswith("Z") else value
+
+
+def _parse_time(value: str, upper: bool = False) -> datetime:
+    # Dates cover the whole day: as an upper bound they mean its last second.
+    if len(value) == 10:
+        value += "T23:59:59+00:00" if upper else "T00:00:00+00:00"
+    parsed = datetime.fromisoformat(_search_time(value))
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclasses.dataclass(slots=True)
+class IssueFilter:
+    """
+    Which issues to list, evaluated by GitHub rather than locally.
+
+    ``labels`` must all be present. Dates are ISO 8601 (``2024-05-01`` or
+    a full timestamp) and bounds are inclusive. Labels and a lower bound
+    on ``updated`` map to query parameters of the REST issues listing;
+    the other fields need the search API (see ``needs_search``).
+    """
+
+    labels: Tuple[str, ...] = ()
+    created_after: Optional[str] = None
+    created_before: Optional[str] = None
+    updated_after: Optional[str] = None
+    updated_before: Optional[str] = None
+    exclude_authors: Tuple[str, ...] = ()
+    min_reactions: int = 0
+    min_comments: int = 0
+
+    def needs_search(self) -> bool:
+        """True if some condition cannot be expressed with the REST issues listing."""
+        return bool(
+            self.created_after
+            or self.created_before
+            or self.updated_before
+            or self.exclude_authors
+            or self.min_reactions > 0
+            or self.min_comments > 0
+        )
+
+    def updated_since(self, since: Optional[str] = None) -> Optional[str]:
+        """The later of ``since`` and ``updated_after``, as a full timestamp."""
+        if not self.updated_after:
+            return since
+        return max(filter(None, (since, _rest_time(self.updated_after))), key=_parse_time)
+
+    def window(self, field: str) -> Tuple[Optional[str], Optional[str]]:
+        """Inclusive ``created`` / ``updated`` bounds as UTC ``YYYY-MM-DDTHH:MM:SSZ`` strings."""
+        low, high = (
+            (self.created_after, self.created_before)
+            if field == "created"
+            else (self.updated_after, self.updated_before)
+        )
+        fmt = "%Y-%m-%dT%H:%M:%SZ"
+        return (
+            _parse_time(low).astimezone(timezone.utc).strftime(fmt) if low else None,
+            _parse_time(high, upper=True).astimezone(timezone.utc).strftime(fmt) if high else None,
+        )
+
+    def excluded_logins(self) -> Tuple[str, ...]:
+        """Author logins to leave out as they appear on issues (``app/x`` is the bot ``x[bot]``)."""
+        logins: List[str] = []
+        for author in self.exclude_authors:
+            if author.startswith("app/"):
+                # REST reports the bot as ``x[bot]``, GraphQL as ``x``.
+                logins.extend((f"{author[4:]}[bot]", author[4:]))
+            else:
+                logins.append(author)
+        return tuple(logins)
+
+    def search_query(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "open",
+        since: Optional[str] = None,
+        bound: Optional[Tuple[str, str]] = None,
+    ) -> str:
+        """
+        Build the ``q`` of a search API request for these conditions.
+
+        ``since`` tightens the lower ``updated`` bound; ``bound`` is an
+        extra ``(field, timestamp)`` upper bound used to page past the
+        search result limit.
+        """
+        terms = [f"repo:{owner}/{repo}", "is:issue"]
+        if state in ("open", "closed"):
+            terms.append(f"state:{state}")
+        terms.extend(f'label:"{label}"' for label in self.labels)
+        windows = {
+            "created": [self.created_after, self.created_before],
+            "updated": [self.updated_since(since), self.updated_before],
+        }
+        if bound is not None:
+            field, upper = bound
+            windows[field][1] = min(
+                filter(None, (windows[field][1], upper)), key=lambda value: _parse_time(value, upper=True)
+            )
+        for field, (low, high) in windows.items():
+            if low and high:
+                terms.append(f"{field}:{_search_time(low)}..{_search_time(high)}")
+            elif low:
+                terms.append(f"{field}:>={_search_time(low)}")
+            elif high:
+                terms.append(f"{field}:<={_search_time(high)}")
+        terms.extend(f"-author:{login}" for login in self.exclude_authors)
+        if self.min_reactions > 0:
+            terms.append(f"reactions:>={self.min_reactions}")
+        if self.min_comments > 0:
+            terms.append(f"comments:>={self.min_comments}")
+        return " ".join(terms)
 
 
 class GitHubClient:
@@ -37,15 +201,42 @@ class GitHubClient:
         token: Optional[str] = None,
         base_url: str = GITHUB_API_BASE,
         session: Optional[requests.Session] = None,
+        max_workers: int = 1,
+        cache: Optional[DiskCache] = None,
+        max_concurrent_requests: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        tokens: Optional[Sequence[str]] = None,
     ) -> None:
+        # Deferred so that commands which never reach GitHub (``--help``,
+        # ``analyze --corpus``) do not pay for importing requests.
+        import requests
+        from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
         self.base_url = base_url.rstrip("/")
         self.session = session or requests.Session()
+        # Optional conditional-request cache: 304 responses cost no rate limit.
+        self.cache = cache
+        # Optional request counters (requests, bytes, cache hits, rate limit).
+        self.metrics = metrics
+        self.max_workers = max(1, max_workers)
+        if self.max_workers > DEFAULT_POOLSIZE:
+            # Let every worker keep its own keep-alive connection.
+            adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        # Shared by all worker threads: paces requests from the X-RateLimit-*
+        # headers, rotates across ``tokens`` and pauses every in-flight fetch
+        # on a secondary rate limit instead of each retrying on its own.
+        self.governor = RateLimitGovernor(list(tokens) if tokens else [token])
+        # Global cap on in-flight requests when several fetches share this
+        # client (e.g. batch mode), so they stay within one token's limits.
+        self._request_slots: Optional[threading.BoundedSemaphore] = None
+        if max_concurrent_requests:
+            self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
         headers: Dict[str, str] = {
             "Accept": "application/vnd.github+json",
             "User-Agent": "demandlens/0.1.0",
         }
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
         self.session.headers.update(headers)
 
     @staticmethod
@@ -75,92 +266,465 @@ class GitHubClient:
 
         raise ValueError(f"Unsupported GitHub repo URL: {repo_url!r}")
 
-    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        resp = self.session.get(url, params=params, timeout=30)
+    @staticmethod
+    def _is_secondary_rate_limit(resp: requests.Response) -> bool:
+        if resp.status_code not in (403, 429):
+            return False
+        if "Retry-After" in resp.headers:
+            return True
+        return "secondary rate limit" in resp.text.lower()
+
+    def _request_slot(self) -> ContextManager[Any]:
+        return self._request_slots if self._request_slots is not None else nullcontext()
+
+    @staticmethod
+    def _is_primary_rate_limit(resp: requests.Response) -> bool:
+        return (
+            resp.status_code in (403, 429)
+            and resp.headers.get("X-RateLimit-Remaining") == "0"
+            and "Retry-After" not in resp.headers
+        )
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        resource: str = "core",
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send one API request through the rate-limit governor.
+
+        Exhausted budgets wait for their reset (or switch token), secondary
+        rate limits pause every request, and 5xx responses and connection
+        errors are retried with jittered exponential backoff. The last
+        response is returned whatever its status.
+        """
+        import requests
+
+        for attempt in range(MAX_RETRIES + 1):
+            token = self.governor.acquire(resource)
+            request_headers = dict(headers or {})
+            if token:
+                request_headers["Authorization"] = f"Bearer {token}"
+            try:
+                with self._request_slot():
+                    start = time.monotonic()
+                    resp = self.session.request(method, url, headers=request_headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= MAX_RETRIES:
+                    raise
+                self._retry_sleep(attempt)
+                continue
+            self._record_response(resp, time.monotonic() - start)
+            self.governor.update(token, resp.headers, resource)
+            if attempt >= MAX_RETRIES:
+                return resp
+            if self._is_primary_rate_limit(resp):
+                # The governor now knows this token is empty until reset.
+                self._count_retry()
+                continue
+            if self._is_secondary_rate_limit(resp):
+                try:
+                    delay = float(resp.headers["Retry-After"])
+                except (KeyError, ValueError):
+                    delay = SECONDARY_RATE_LIMIT_WAIT * (2**attempt)
+                self.governor.pause(delay)
+                self._count_retry()
+                continue
+            if resp.status_code in RETRYABLE_STATUSES:
+                self._retry_sleep(attempt)
+                continue
+            return resp
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _retry_sleep(self, attempt: int) -> None:
+        self._count_retry()
+        time.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)))
+
+    def _count_retry(self) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("github_retries_total")
+
+    def _record_response(self, resp: requests.Response, elapsed: float) -> None:
+        if self.metrics is None:
+            return
+        self.metrics.inc("github_requests_total")
+        self.metrics.inc("github_response_bytes_total", len(resp.content))
+        self.metrics.observe("github_request_seconds", elapsed)
+        if resp.status_code == 304:
+            self.metrics.inc("github_cache_hits_total")
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.metrics.set_gauge("github_rate_limit_remaining", int(remaining))
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None, resource: str = "core") -> Any:
+        data, _ = self._get_page(path, params, resource)
+        return data
+
+    def _get_page(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        resource: str = "core",
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        GET an API path (or an absolute URL taken from a ``Link`` header) and
+        return the decoded body together with the ``rel="next"`` URL, if any.
+        """
+        if path.startswith(("http://", "https://")):
+            url = path
+        else:
+            url = f"{self.base_url}/{path.lstrip('/')}"
+
+        cache_key: Optional[str] = None
+        cached: Optional[Dict[str, Any]] = None
+        headers: Dict[str, str] = {}
+        if self.cache is not None:
+            cache_key = DiskCache.make_key("GET", url, params or {})
+            cached = self.cache.get(cache_key)
+            if cached:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+        resp = self._send("GET", url, resource=resource, headers=headers, params=params, timeout=30)
         if resp.status_code >= 400:
             raise RuntimeError(
                 f"GitHub API error {resp.status_code} for {url}: {resp.text[:500]}"
             )
-        return resp.json()
+        if resp.status_code == 304 and cached:
+            return cached["body"], cached.get("next")
+
+        data = resp.json()
+        next_url = resp.links.get("next", {}).get("url")
+        if cache_key is not None:
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.set(
+                    cache_key,
+                    {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "next": next_url,
+                        "body": data,
+                    },
+                )
+        return data, next_url
+
+    @staticmethod
+    def _issue_from_item(item: Dict[str, Any]) -> Issue:
+        return Issue(
+            id=item["id"],
+            number=item["number"],
+            title=item.get("title") or "",
+            body=item.get("body") or "",
+            state=item.get("state") or "",
+            html_url=item.get("html_url") or "",
+            user=(item.get("user") or {}).get("login"),
+            comments=[],
+            created_at=item.get("created_at"),
+            updated_at=item.get("updated_at"),
+            comment_count=item.get("comments"),
+            labels=[
+                label.get("name") or "" if isinstance(label, dict) else str(label)
+                for label in item.get("labels") or []
+            ],
+            reaction_count=(item.get("reactions") or {}).get("total_count"),
+        )
+
+    @staticmethod
+    def _comment_from_item(item: Dict[str, Any]) -> IssueComment:
+        return IssueComment(
+            id=item["id"],
+            body=item.get("body") or "",
+            user=(item.get("user") or {}).get("login"),
+        )
 
     def list_issues(
         self,
         owner: str,
         repo: str,
         state: str = "open",
-        max_issues: int = 100,
+        max_issues: Optional[int] = 100,
         include_pull_requests: bool = False,
+        since: Optional[str] = None,
+        sort: str = "created",
+        issue_filter: Optional[IssueFilter] = None,
     ) -> List[Issue]:
         """
         List issues for a repository (optionally excluding PRs).
 
         GitHub's /issues endpoint returns both issues and pull requests.
+        ``since`` (ISO 8601) restricts the listing to issues updated at or
+        after that time; ``max_issues=None`` lists everything that matches.
+        ``issue_filter`` conditions are applied by GitHub: through the
+        listing's query parameters when possible, otherwise through the
+        search API, which also leaves out pull requests.
         """
-        issues: List[Issue] = []
-        per_page = 100
-        page = 1
+        return [
+            issue
+            for page in self.iter_issue_pages(
+                owner,
+                repo,
+                state=state,
+                max_issues=max_issues,
+                include_pull_requests=include_pull_requests,
+                since=since,
+                sort=sort,
+                issue_filter=issue_filter,
+            )
+            for issue in page
+        ]
+
+    def iter_issue_pages(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "open",
+        max_issues: Optional[int] = 100,
+        include_pull_requests: bool = False,
+        since: Optional[str] = None,
+        sort: str = "created",
+        issue_filter: Optional[IssueFilter] = None,
+        start_page: int = 1,
+        on_page: Optional[Callable[[int], Any]] = None,
+    ) -> Iterator[List[Issue]]:
+        """
+        Yield the issues of ``list_issues`` one API page at a time.
+
+        ``start_page`` skips the listing's first pages (to resume an
+        interrupted listing). ``on_page`` gets the number of every listing
+        page once its issues have been consumed, including pages that held
+        only pull requests. Search listings always start from the top and
+        do not report pages.
+        """
+        if issue_filter is not None and issue_filter.needs_search():
+            yield from self._iter_search_pages(owner, repo, state, max_issues, since, sort, issue_filter)
+            return
+
+        count = 0
+        # Page size must stay fixed across pages or the offsets drift.
+        per_page = 100 if max_issues is None else max(1, min(100, max_issues))
+        page = max(1, start_page)
 
-        while len(issues) < max_issues:
-            params = {
+        while max_issues is None or count < max_issues:
+            params: Dict[str, Any] = {
                 "state": state,
-                "per_page": min(per_page, max_issues - len(issues)),
+                "per_page": per_page,
                 "page": page,
-                "sort": "created",
+                "sort": sort,
                 "direction": "desc",
             }
+            if issue_filter is not None:
+                if issue_filter.labels:
+                    params["labels"] = ",".join(issue_filter.labels)
+                since = issue_filter.updated_since(since)
+            if since:
+                params["since"] = since
             data = self._get(f"repos/{owner}/{repo}/issues", params=params)
             if not data:
                 break
 
+            issues: List[Issue] = []
             for item in data:
                 # PRs have "pull_request" field; skip by default
                 if not include_pull_requests and "pull_request" in item:
                     continue
-                issues.append(
-                    Issue(
-                        id=item["id"],
-                        number=item["number"],
-                        title=item.get("title") or "",
-                        body=item.get("body") or "",
-                        state=item.get("state") or "",
-                        html_url=item.get("html_url") or "",
-                        user=(item.get("user") or {}).get("login"),
-                        comments=[],
-                    )
-                )
-                if len(issues) >= max_issues:
+                issues.append(self._issue_from_item(item))
+                if max_issues is not None and count + len(issues) >= max_issues:
                     break
+            count += len(issues)
+            if issues:
+                yield issues
+            if on_page is not None:
+                on_page(page)
 
             if len(data) < per_page:
                 break
             page += 1
 
-        return issues
+    def _iter_search_pages(
+        self,
+        owner: str,
+        repo: str,
+        state: str,
+        max_issues: Optional[int],
+        since: Optional[str],
+        sort: str,
+        issue_filter: IssueFilter,
+    ) -> Iterator[List[Issue]]:
+        """
+        List issues through the search API, newest first by ``sort``.
+
+        A search returns at most ``SEARCH_RESULT_LIMIT`` results, so once
+        they are used up the query is repeated with an upper bound at the
+        oldest timestamp seen; issues sharing that timestamp are skipped
+        the second time.
+        """
+        field = "updated" if sort == "updated" else "created"
+        per_page = 100 if max_issues is None else max(1, min(100, max_issues))
+        count = 0
+        bound: Optional[Tuple[str, str]] = None
+        seen_at_bound: set[int] = set()
+
+        while max_issues is None or count < max_issues:
+            query = issue_filter.search_query(owner, repo, state, since, bound)
+            oldest: Optional[str] = None
+            at_oldest: set[int] = set()
+            page = 1
+            exhausted = False
+            while max_issues is None or count < max_issues:
+                params = {"q": query, "sort": field, "order": "desc", "per_page": per_page, "page": page}
+                data = self._get("search/issues", params=params, resource="search")
+                items = (data or {}).get("items") or []
+                issues: List[Issue] = []
+                for item in items:
+                    stamp = item.get(f"{field}_at") or ""
+                    if stamp != oldest:
+                        oldest, at_oldest = stamp, set()
+                    at_oldest.add(item["number"])
+                    if item["number"] in seen_at_bound:
+                        continue
+                    issues.append(self._issue_from_item(item))
+                    if max_issues is not None and count + len(issues) >= max_issues:
+                        break
+                count += len(issues)
+                if issues:
+                    yield issues
+                if len(items) < per_page:
+                    exhausted = True
+                    break
+                if page * per_page >= SEARCH_RESULT_LIMIT:
+                    break
+                page += 1
+            if exhausted or oldest is None:
+                break
+            if bound is not None and bound[1] == oldest:
+                # A single timestamp holds more issues than one search returns.
+                if self.metrics is not None:
+                    self.metrics.inc("github_search_truncated_total")
+                print(
+                    f"[demandlens] Search results for {owner}/{repo} truncated: more than "
+                    f"{SEARCH_RESULT_LIMIT} issues share the {field} time {oldest}.",
+                    file=sys.stderr,
+                )
+                break
+            bound = (field, oldest)
+            seen_at_bound = at_oldest
+
+    def _fetch_issue_comments(
+        self,
+        owner: str,
+        repo: str,
+        number: int,
+        comment_count: Optional[int] = None,
+    ) -> List[IssueComment]:
+        """Fetch a full comment thread, following ``Link: rel="next"`` pages."""
+        if comment_count == 0:
+            return []
+        # A known small thread fits in one right-sized page.
+        per_page = min(100, comment_count) if comment_count else 100
+        comments: List[IssueComment] = []
+        next_url: Optional[str] = f"repos/{owner}/{repo}/issues/{number}/comments"
+        params: Optional[Dict[str, Any]] = {"per_page": per_page}
+        while next_url:
+            data, next_url = self._get_page(next_url, params)
+            # The next link already carries the query string.
+            params = None
+            comments.extend(self._comment_from_item(c) for c in data)
+        return comments
+
+    def list_comments_since(
+        self,
+        owner: str,
+        repo: str,
+        since: str,
+    ) -> Dict[int, List[IssueComment]]:
+        """
+        Fetch every comment in the repository created or edited after ``since``.
+
+        Uses the repository-wide comments endpoint, so the cost depends on the
+        amount of new activity rather than on the number of issues.
+        Returns comments grouped by issue number, oldest first.
+        """
+        by_issue: Dict[int, List[IssueComment]] = {}
+        per_page = 100
+        page = 1
+        while True:
+            data = self._get(
+                f"repos/{owner}/{repo}/issues/comments",
+                params={
+                    "since": since,
+                    "sort": "updated",
+                    "direction": "asc",
+                    "per_page": per_page,
+                    "page": page,
+                },
+            )
+            if not data:
+                break
+            for c in data:
+                issue_url = c.get("issue_url") or ""
+                try:
+                    number = int(issue_url.rstrip("/").rsplit("/", 1)[-1])
+                except ValueError:
+                    continue
+                by_issue.setdefault(number, []).append(self._comment_from_item(c))
+            if len(data) < per_page:
+                break
+            page += 1
+        return by_issue
 
     def fetch_comments_for_issues(
         self,
         owner: str,
         repo: str,
         issues: Iterable[Issue],
+        max_workers: Optional[int] = None,
+        progress: Optional[Callable[[int], Any]] = None,
     ) -> List[Issue]:
-        """Populate comments for the given issues."""
+        """
+        Populate comments for the given issues.
+
+        Issues whose listing reported zero comments are not requested at all.
+        With more than one worker the per-issue requests run on a thread pool
+        sharing this client's session; the returned list keeps input order.
+        ``progress`` is called with the number of newly completed issues
+        (e.g. ``tqdm.update``).
+        """
+        issues = list(issues)
+        targets: List[Issue] = []
         for issue in issues:
             if getattr(issue, "number", None) is None:
                 continue
-            comments_data = self._get(
-                f"repos/{owner}/{repo}/issues/{issue.number}/comments",
-                params={"per_page": 100},
+            if getattr(issue, "comment_count", None) == 0:
+                issue.comments = []
+                continue
+            targets.append(issue)
+        if progress is not None and len(targets) < len(issues):
+            progress(len(issues) - len(targets))
+        workers = min(max_workers or self.max_workers, len(targets)) or 1
+
+        def fetch(issue: Issue) -> List[IssueComment]:
+            return self._fetch_issue_comments(
+                owner, repo, issue.number, getattr(issue, "comment_count", None)
             )
-            comments: List[IssueComment] = []
-            for c in comments_data:
-                comments.append(
-                    IssueComment(
-                        id=c["id"],
-                        body=c.get("body") or "",
-                        user=(c.get("user") or {}).get("login"),
-                    )
-                )
-            issue.comments = comments
-        return list(issues)
 
+        if workers == 1:
+            for issue in targets:
+                issue.comments = fetch(issue)
+                if progress is not None:
+                    progress(1)
+            return issues
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(fetch, targets)
+            for issue, comments in zip(targets, results):
+                issue.comments = comments
+                if progress is not None:
+                    progress(1)
+        return issues
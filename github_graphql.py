@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .github_client import GitHubClient, Issue, IssueComment, IssueFilter
+
+
+_ISSUE_STATES = {
+    "open": ["OPEN"],
+    "closed": ["CLOSED"],
+    "all": None,
+}
+
+_ISSUES_QUERY = """
+query($owner: String!, $repo: String!, $first: Int!, $after: String,
+      $states: [IssueState!], $orderBy: IssueOrder, $since: DateTime,
+      $labels: [String!], $commentsFirst: Int!) {
+  repository(owner: $owner, name: $repo) {
+    issues(first: $first, after: $after, states: $states, orderBy: $orderBy,
+           filterBy: {since: $since, labels: $labels}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        number
+        title
+        body
+        state
+        url
+        createdAt
+        updatedAt
+        author { login }
+        labels(first: 100) { nodes { name } }
+        reactions { totalCount }
+        comments(first: $commentsFirst) {
+          totalCount
+          pageInfo { hasNextPage endCursor }
+          nodes { databaseId body author { login } }
+        }
+      }
+    }
+  }
+}
+"""
+
+_COMMENTS_QUERY = """
+query($owner: String!, $repo: String!, $number: Int!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    issue(number: $number) {
+      comments(first: 100, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { databaseId body author { login } }
+      }
+    }
+  }
+}
+"""
+
+
+class GitHubGraphQLClient(GitHubClient):
+    """
+    GitHub client that lists issues through the GraphQL API.
+
+    Each listing query returns up to ``page_size`` issues together with
+    their first ``comments_per_issue`` comments, so most threads need no
+    follow-up request. ``fetch_comments_for_issues`` only continues the
+    threads that were cut off. Produces the same ``Issue`` /
+    ``IssueComment`` records as the REST client. Requires a token.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        comments_per_issue: int = 50,
+        page_size: int = 50,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.comments_per_issue = max(0, min(100, comments_per_issue))
+        self.page_size = max(1, min(100, page_size))
+        # (owner, repo, number) -> end cursor of a thread truncated by list_issues
+        self._comment_cursors: Dict[Tuple[str, str, int], str] = {}
+        self._cursor_lock = threading.Lock()
+
+    def _post_graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{self.base_url}/graphql"
+        resp = self._send(
+            "POST",
+            url,
+            resource="graphql",
+            json={"query": query, "variables": variables},
+            timeout=60,
+        )
+        if resp.status_code >= 400:
+            raise RuntimeError(
+                f"GitHub GraphQL error {resp.status_code} for {url}: {resp.text[:500]}"
+            )
+        payload = resp.json()
+        if payload.get("errors"):
+            messages = "; ".join(e.get("message", "") for e in payload["errors"])
+            raise RuntimeError(f"GitHub GraphQL query failed: {messages}")
+        return payload.get("data") or {}
+
+    @staticmethod
+    def _comment_from_node(node: Dict[str, Any]) -> IssueComment:
+        return IssueComment(
+            id=node.get("databaseId") or 0,
+            body=node.get("body") or "",
+            user=(node.get("author") or {}).get("login"),
+        )
+
+    def iter_issue_pages(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "open",
+        max_issues: Optional[int] = 100,
+        include_pull_requests: bool = False,
+        since: Optional[str] = None,
+        sort: str = "created",
+        issue_filter: Optional[IssueFilter] = None,
+        start_page: int = 1,
+        on_page: Optional[Callable[[int], Any]] = None,
+    ) -> Iterator[List[Issue]]:
+        """
+        Yield issues (never pull requests) with their first comments attached.
+
+        Mirrors ``GitHubClient.iter_issue_pages``; ``include_pull_requests``
+        is accepted for compatibility but GraphQL's ``issues`` connection
+        has no pull requests. The connection can filter by one label and a
+        lower ``updated`` bound only (several labels match *any* of them),
+        so other ``issue_filter`` conditions are left to the REST search.
+        ``start_page`` and ``on_page`` are ignored: connection cursors do
+        not survive a restart, so the listing always starts from the top.
+        """
+        if state not in _ISSUE_STATES:
+            raise ValueError(f"Unsupported issue state: {state!r}")
+        if issue_filter is not None and (issue_filter.needs_search() or len(issue_filter.labels) > 1):
+            yield from super().iter_issue_pages(
+                owner, repo, state, max_issues, include_pull_requests, since, sort, issue_filter, start_page, on_page
+            )
+            return
+        labels = list(issue_filter.labels) if issue_filter is not None else []
+        if issue_filter is not None:
+            since = issue_filter.updated_since(since)
+
+        count = 0
+        after: Optional[str] = None
+        order_field = "UPDATED_AT" if sort == "updated" else "CREATED_AT"
+
+        while max_issues is None or count < max_issues:
+            first = self.page_size
+            if max_issues is not None:
+                first = min(first, max_issues - count)
+            data = self._post_graphql(
+                _ISSUES_QUERY,
+                {
+                    "owner": owner,
+                    "repo": repo,
+                    "first": first,
+                    "after": after,
+                    "states": _ISSUE_STATES[state],
+                    "orderBy": {"field": order_field, "direction": "DESC"},
+                    "since": since,
+                    "labels": labels or None,
+                    "commentsFirst": self.comments_per_issue,
+                },
+            )
+            connection = (data.get("repository") or {}).get("issues") or {}
+            issues: List[Issue] = []
+            for node in connection.get("nodes") or []:
+                comments_conn = node.get("comments") or {}
+                issue = Issue(
+                    id=node.get("databaseId") or 0,
+                    number=node["number"],
+                    title=node.get("title") or "",
+                    body=node.get("body") or "",
+                    state=(node.get("state") or "").lower(),
+                    html_url=node.get("url") or "",
+                    user=(node.get("author") or {}).get("login"),
+                    comments=[self._comment_from_node(c) for c in comments_conn.get("nodes") or []],
+                    created_at=node.get("createdAt"),
+                    updated_at=node.get("updatedAt"),
+                    comment_count=comments_conn.get("totalCount"),
+                    labels=[n.get("name") or "" for n in (node.get("labels") or {}).get("nodes") or []],
+                    reaction_count=(node.get("reactions") or {}).get("totalCount"),
+                )
+                page_info = comments_conn.get("pageInfo") or {}
+                if page_info.get("hasNextPage") and page_info.get("endCursor"):
+                    with self._cursor_lock:
+                        self._comment_cursors[(owner, repo, issue.number)] = page_info["endCursor"]
+                issues.append(issue)
+            count += len(issues)
+            if issues:
+                yield issues
+
+            page_info = connection.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                break
+            after = page_info.get("endCursor")
+
+    def _fetch_issue_comments(
+        self,
+        owner: str,
+        repo: str,
+        number: int,
+        comment_count: Optional[int] = None,
+    ) -> List[IssueComment]:
+        """Fetch the rest of a thread, resuming after a truncated listing if possible."""
+        if comment_count == 0:
+            return []
+        with self._cursor_lock:
+            after = self._comment_cursors.pop((owner, repo, number), None)
+        comments: List[IssueComment] = []
+        while True:
+            data = self._post_graphql(
+                _COMMENTS_QUERY,
+                {"owner": owner, "repo": repo, "number": number, "after": after},
+            )
+            issue = (data.get("repository") or {}).get("issue") or {}
+            connection = issue.get("comments") or {}
+            comments.extend(self._comment_from_node(c) for c in connection.get("nodes") or [])
+            page_info = connection.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return comments
+            after = page_info.get("endCursor")
+
+    def fetch_comments_for_issues(
+        self,
+        owner: str,
+        repo: str,
+        issues: Iterable[Issue],
+        max_workers: Optional[int] = None,
+        progress: Optional[Callable[[int], Any]] = None,
+    ) -> List[Issue]:
+        """Complete only the comment threads that ``list_issues`` truncated."""
+        issues = list(issues)
+        pending: List[Issue] = []
+        prefixes: Dict[int, List[IssueComment]] = {}
+        for issue in issues:
+            count = getattr(issue, "comment_count", None)
+            have = issue.comments or []
+            if count is not None and len(have) >= count:
+                continue
+            with self._cursor_lock:
+                resumable = (owner, repo, issue.number) in self._comment_cursors
+            # Keep the comments we already have only if we can continue after them.
+            prefixes[issue.number] = list(have) if resumable else []
+            pending.append(issue)
+        if progress is not None and len(pending) < len(issues):
+            progress(len(issues) - len(pending))
+
+        super().fetch_comments_for_issues(
+            owner, repo, pending, max_workers=max_workers, progress=progress
+        )
+        for issue in pending:
+            issue.comments = prefixes[issue.number] + (issue.comments or [])
+        return issues
@@ -1,48 +1,98 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Optional
+import dataclasses
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Deque, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Sized, Tuple, overload
 
 from .github_client import Issue, IssueComment
 
 
-@dataclass
+def _comment_text(user: Optional[str], body: str) -> str:
+    # Keep concise metadata but focus on actual text
+    prefix = f"@{user}: " if user else ""
+    return f"{prefix}{body}"
+
+
+def _format_comment(comment: IssueComment) -> str:
+    return _comment_text(getattr(comment, "user", None), comment.body)
+
+
+class CommentTexts(Sequence[str]):
+    """
+    Read-only view that renders ``"@user: body"`` strings on access.
+
+    Lets ``IssueText`` reference the fetched ``IssueComment`` objects
+    instead of holding a second copy of every comment body.
+    """
+
+    __slots__ = ("_comments",)
+
+    def __init__(self, comments: Sequence[IssueComment]) -> None:
+        self._comments = comments
+
+    def __len__(self) -> int:
+        return len(self._comments)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        if isinstance(index, slice):
+            return [_format_comment(c) for c in self._comments[index]]
+        return _format_comment(self._comments[index])
+
+    def __repr__(self) -> str:
+        return f"CommentTexts({len(self)} comments)"
+
+
+@dataclass(slots=True)
 class IssueText:
     """Flattened textual representation of an Issue for LLM consumption."""
 
     number: int
     title: str
     body: str
-    comments: List[str]
+    comments: Sequence[str]
     url: str
     state: str
+    # Numbers of near-duplicate issues folded into this one (see dedup.py).
+    duplicates: List[int] = field(default_factory=list)
 
     def to_prompt_block(self) -> str:
         comments_block = ""
         if self.comments:
             comments_joined = "\n---\n".join(self.comments)
             comments_block = f"\nComments:\n{comments_joined}"
+        duplicates_line = ""
+        if self.duplicates:
+            numbers = ", ".join(f"#{n}" for n in self.duplicates)
+            duplicates_line = f"Duplicates (same report, also count as evidence): {numbers}\n"
         return (
             f"Issue #{self.number}: {self.title}\n"
             f"State: {self.state}\n"
             f"URL: {self.url}\n"
+            f"{duplicates_line}"
             f"Body:\n{self.body or '(no body)'}"
             f"{comments_block}"
         )
 
 
 def issue_to_text(issue: Issue) -> IssueText:
-    comments: List[str] = []
-    if issue.comments:
-        for c in issue.comments:
-            # Keep concise metadata but focus on actual text
-            prefix = f"@{c.user}: " if getattr(c, "user", None) else ""
-            comments.append(f"{prefix}{c.body}")
+    # Strings are shared with ``issue`` and comments are rendered lazily,
+    # so conversion adds only this small record per issue.
     return IssueText(
         number=issue.number,
         title=issue.title or "",
         body=issue.body or "",
-        comments=comments,
+        comments=CommentTexts(issue.comments or []),
         url=issue.html_url,
         state=issue.state,
     )
@@ -51,3 +101,286 @@ def issue_to_text(issue: Issue) -> IssueText:
 def bulk_issues_to_text(issues: Iterable[Issue]) -> List[IssueText]:
     return [issue_to_text(i) for i in issues]
 
+
+# Rules understood by ``NoiseFilter``; all are enabled by default.
+NOISE_RULES = ("templates", "logs", "quotes", "reactions", "bots")
+# Accounts whose comments are dropped by the "bots" rule, in addition to
+# any login ending in "[bot]" (the suffix GitHub gives app accounts).
+DEFAULT_BOT_LOGINS = frozenset(
+    {
+        "github-actions",
+        "dependabot",
+        "dependabot-preview",
+        "renovate",
+        "stale",
+        "codecov",
+        "codecov-commenter",
+        "netlify",
+        "vercel",
+        "sonarcloud",
+        "coveralls",
+        "allcontributors",
+        "mergify",
+        "linux-foundation-easycla",
+        "cla-assistant",
+    }
+)
+# Inputs at least this long are filtered in a process pool when the number
+# of processes is left to ``filter_issue_texts``.
+PROCESS_POOL_MIN_ISSUES = 2000
+# Issues per task sent to a worker process.
+FILTER_BATCH_SIZE = 256
+
+# Issue-template instructions and unanswered issue-form fields.
+_HTML_COMMENT = re.compile(r"<!--.*?(?:-->|\Z)", re.DOTALL)
+_NO_RESPONSE = re.compile(
+    r"^(?:#{1,6}[^\n]*\n\s*)?_No response_[ \t]*(?:\n|\Z)", re.MULTILINE
+)
+# E-mail style replies: the quoted text already appears earlier in the thread.
+_QUOTE_LINE = re.compile(r"^[ \t]*>[^\n]*(?:\n|\Z)", re.MULTILINE)
+_REPLY_HEADER = re.compile(r"^On [^\n]{1,200} wrote:[ \t]*(?:\n|\Z)", re.MULTILINE)
+_BLANK_RUN = re.compile(r"\n{3,}")
+# Stack frames and log records (Python, JVM, native backtraces, timestamped logs).
+_LOG_LINE = re.compile(
+    r"\s*(?:Traceback \(most recent call last\)"
+    r'|File "[^"]*", line \d+'
+    r"|at [\w$.<>/]+\("
+    r"|Caused by:"
+    r"|\.\.\. \d+ more"
+    r"|#\d+\s+0x[0-9a-fA-F]+"
+    r"|\[?\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}"
+    r"|\[?(?:TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b)"
+)
+_FENCE = re.compile(r"[ \t]*(```|~~~)")
+# Comments that only express agreement: "+1", "me too", "any update?", 👍 ...
+_REACTION_WORD = (
+    r"(?:[+-]1|me\s+too|same(?:\s+(?:here|issue|problem|for\s+me))?|any\s+updates?|bump|upvote"
+    r"|[\U0001F44D\U0001F44E\u2764\U0001F389\U0001F680\U0001F64F\U0001F440]\uFE0F?)"
+)
+_REACTION_COMMENT = re.compile(
+    rf"[\s.!?,]*{_REACTION_WORD}(?:[\s.!?,]*{_REACTION_WORD})*[\s.!?,]*", re.IGNORECASE
+)
+_REACTION_MAX_CHARS = 80
+
+
+@dataclass(slots=True)
+class NoiseStats:
+    """Size of the filtered issue text before and after ``NoiseFilter``."""
+
+    issues: int = 0
+    comments_dropped: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def add(self, other: NoiseStats) -> None:
+        for f in dataclasses.fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+def _measure(texts: Iterable[str]) -> Tuple[int, int]:
+    from .tokens import estimate_tokens  # tokens imports this module
+
+    size = tokens = 0
+    for text in texts:
+        size += len(text.encode("utf-8"))
+        tokens += estimate_tokens(text)
+    return size, tokens
+
+
+class NoiseFilter:
+    """
+    Strip text that costs prompt tokens without describing a user need.
+
+    Rules (see ``NOISE_RULES``):
+
+    - ``templates``: HTML comments and unanswered issue-form fields;
+    - ``logs``: stack traces, log dumps and long code blocks are cut to
+      their first and last ``log_context_lines`` lines;
+    - ``quotes``: quoted replies in comments;
+    - ``reactions``: "+1" / "me too" comments, replaced by one count;
+    - ``bots``: comments by CI, stale and dependency bots.
+
+    Instances hold only configuration and compiled patterns, so they can
+    be sent to worker processes.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[str] = NOISE_RULES,
+        max_log_lines: int = 40,
+        log_context_lines: int = 10,
+        bot_logins: Iterable[str] = DEFAULT_BOT_LOGINS,
+    ) -> None:
+        self.rules: FrozenSet[str] = frozenset(rules)
+        unknown = self.rules - set(NOISE_RULES)
+        if unknown:
+            raise ValueError(
+                f"Unknown noise filter rule(s): {', '.join(sorted(unknown))} "
+                f"(expected {', '.join(NOISE_RULES)})."
+            )
+        self.max_log_lines = max(max_log_lines, 2 * log_context_lines + 1)
+        self.log_context_lines = log_context_lines
+        self.bot_logins = frozenset(login.lower() for login in bot_logins)
+
+    def is_bot(self, login: Optional[str]) -> bool:
+        if "bots" not in self.rules or not login:
+            return False
+        login = login.lower()
+        return login.endswith("[bot]") or login in self.bot_logins
+
+    def is_reaction(self, text: str) -> bool:
+        return (
+            "reactions" in self.rules
+            and len(text) <= _REACTION_MAX_CHARS
+            and _REACTION_COMMENT.fullmatch(text) is not None
+        )
+
+    def _collapse(self, lines: List[str], out: List[str]) -> None:
+        if len(lines) <= self.max_log_lines:
+            out.extend(lines)
+            return
+        keep = self.log_context_lines
+        out.extend(lines[:keep])
+        out.append(f"[... {len(lines) - 2 * keep} lines omitted ...]")
+        out.extend(lines[-keep:])
+
+    def _shorten_logs(self, text: str) -> str:
+        # One pass over the lines: fenced blocks and runs of log-like lines
+        # are buffered and cut down when they exceed ``max_log_lines``.
+        out: List[str] = []
+        run: List[str] = []
+        fence: Optional[str] = None
+        for line in text.split("\n"):
+            if fence is not None:
+                match = _FENCE.match(line)
+                if match and match.group(1) == fence:
+                    self._collapse(run, out)
+                    run = []
+                    out.append(line)
+                    fence = None
+                else:
+                    run.append(line)
+                continue
+            match = _FENCE.match(line)
+            if match:
+                self._collapse(run, out)
+                run = []
+                out.append(line)
+                fence = match.group(1)
+            elif _LOG_LINE.match(line) or (run and line[:1].isspace() and line.strip()):
+                # Indented lines continue a trace (e.g. the source line under a Python frame).
+                run.append(line)
+            else:
+                self._collapse(run, out)
+                run = []
+                out.append(line)
+        self._collapse(run, out)
+        return "\n".join(out)
+
+    def clean(self, text: str, reply: bool = False) -> str:
+        """Apply the text rules to an issue body, or to a comment if ``reply``."""
+        if not text:
+            return text
+        if "templates" in self.rules:
+            text = _HTML_COMMENT.sub("", text)
+            text = _NO_RESPONSE.sub("", text)
+        if reply and "quotes" in self.rules:
+            text = _REPLY_HEADER.sub("", text)
+            text = _QUOTE_LINE.sub("", text)
+        if "logs" in self.rules and text.count("\n") >= self.max_log_lines:
+            text = self._shorten_logs(text)
+        return _BLANK_RUN.sub("\n\n", text).strip()
+
+    def apply(self, text: IssueText) -> Tuple[IssueText, NoiseStats]:
+        """Return the filtered copy of ``text`` and how much it shrank."""
+        if isinstance(text.comments, CommentTexts):
+            source = [(c.user, c.body) for c in text.comments._comments]
+        else:
+            source = [(None, c) for c in text.comments]
+        before = [text.body, *text.comments]
+
+        comments: List[str] = []
+        dropped = reactions = 0
+        for user, body in source:
+            if self.is_bot(user):
+                dropped += 1
+                continue
+            body = self.clean(body, reply=True)
+            if not body:
+                dropped += 1
+            elif self.is_reaction(body):
+                dropped += 1
+                reactions += 1
+            else:
+                comments.append(_comment_text(user, body))
+        if reactions:
+            comments.append(f"({reactions} more '+1' / 'me too' comment(s))")
+        body = self.clean(text.body)
+
+        stats = NoiseStats(issues=1, comments_dropped=dropped)
+        stats.bytes_before, stats.tokens_before = _measure(before)
+        stats.bytes_after, stats.tokens_after = _measure([body, *comments])
+        return dataclasses.replace(text, body=body, comments=comments), stats
+
+
+def _filter_batch(noise_filter: NoiseFilter, batch: List[IssueText]) -> Tuple[List[IssueText], NoiseStats]:
+    total = NoiseStats()
+    texts: List[IssueText] = []
+    for text in batch:
+        cleaned, stats = noise_filter.apply(text)
+        texts.append(cleaned)
+        total.add(stats)
+    return texts, total
+
+
+def filter_issue_texts(
+    texts: Iterable[IssueText],
+    noise_filter: NoiseFilter,
+    stats: Optional[NoiseStats] = None,
+    processes: Optional[int] = None,
+) -> Iterator[IssueText]:
+    """
+    Lazily apply ``noise_filter`` to ``texts``, adding the savings to ``stats``.
+
+    With ``processes`` > 1 the rules run in a process pool, in batches of
+    ``FILTER_BATCH_SIZE`` with a bounded number in flight, so streamed
+    input keeps streaming and order is preserved. ``None`` uses every CPU
+    for inputs of known length of at least ``PROCESS_POOL_MIN_ISSUES``
+    and stays in this process otherwise.
+    """
+    stats = stats if stats is not None else NoiseStats()
+    if processes is None:
+        large = isinstance(texts, Sized) and len(texts) >= PROCESS_POOL_MIN_ISSUES
+        processes = (os.cpu_count() or 1) if large else 1
+    if processes <= 1:
+        for text in texts:
+            cleaned, issue_stats = noise_filter.apply(text)
+            stats.add(issue_stats)
+            yield cleaned
+        return
+
+    iterator = iter(texts)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending: Deque["Future[Tuple[List[IssueText], NoiseStats]]"] = deque()
+        while True:
+            batch = list(islice(iterator, FILTER_BATCH_SIZE))
+            if batch:
+                pending.append(pool.submit(_filter_batch, noise_filter, batch))
+            # Keep every worker busy but never buffer the whole input.
+            while pending and (not batch or len(pending) > 2 * processes or pending[0].done()):
+                cleaned, batch_stats = pending.popleft().result()
+                stats.add(batch_stats)
+                yield from cleaned
+            if not batch:
+                return
+
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from .github_client import GitHubClient, Issue, IssueComment, IssueFilter
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    state TEXT NOT NULL,
+    html_url TEXT NOT NULL,
+    user TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    labels TEXT,
+    reaction_count INTEGER,
+    PRIMARY KEY (owner, repo, number)
+);
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    user TEXT
+);
+CREATE INDEX IF NOT EXISTS comments_by_issue ON comments (owner, repo, number);
+CREATE TABLE IF NOT EXISTS sync_state (
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    last_synced_at TEXT NOT NULL,
+    listing TEXT,
+    PRIMARY KEY (owner, repo)
+);
+"""
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _listing_bounds(state: str, max_issues: Optional[int], issue_filter: Optional[IssueFilter]) -> Dict[str, Any]:
+    return {
+        "state": state,
+        "max_issues": max_issues,
+        "filter": dataclasses.asdict(issue_filter) if issue_filter is not None else None,
+    }
+
+
+def _covers(listed: Dict[str, Any], wanted: Dict[str, Any]) -> bool:
+    """True if a full listing with bounds ``listed`` fetched every issue ``wanted`` asks for."""
+    if listed["max_issues"] is None:
+        return listed["state"] in ("all", wanted["state"]) and listed["filter"] in (None, wanted["filter"])
+    # A capped listing only covers the same query with an equal or smaller cap.
+    return (
+        listed["state"] == wanted["state"]
+        and listed["filter"] == wanted["filter"]
+        and wanted["max_issues"] is not None
+        and wanted["max_issues"] <= listed["max_issues"]
+    )
+
+
+def _filter_sql(issue_filter: IssueFilter) -> tuple[List[str], List[Any]]:
+    """SQL conditions on ``issues`` rows equivalent to ``issue_filter``, with their parameters."""
+    conditions: List[str] = []
+    values: List[Any] = []
+    for label in issue_filter.labels:
+        # GitHub matches label names case-insensitively.
+        conditions.append("EXISTS (SELECT 1 FROM json_each(issues.labels) WHERE lower(value) = lower(?))")
+        values.append(label)
+    for field in ("created", "updated"):
+        low, high = issue_filter.window(field)
+        if low:
+            conditions.append(f"{field}_at >= ?")
+            values.append(low)
+        if high:
+            conditions.append(f"{field}_at <= ?")
+            values.append(high)
+    logins = issue_filter.excluded_logins()
+    if logins:
+        conditions.append(f"(user IS NULL OR user NOT IN ({','.join('?' * len(logins))}))")
+        values.extend(logins)
+    if issue_filter.min_reactions > 0:
+        conditions.append("reaction_count >= ?")
+        values.append(issue_filter.min_reactions)
+    if issue_filter.min_comments > 0:
+        conditions.append(
+            "(SELECT COUNT(*) FROM comments WHERE comments.owner = issues.owner "
+            "AND comments.repo = issues.repo AND comments.number = issues.number) >= ?"
+        )
+        values.append(issue_filter.min_comments)
+    return conditions, values
+
+
+class IssueStore:
+    """
+    Local SQLite mirror of a repository's issues and comments.
+
+    Lets repeated runs refresh only what changed on GitHub since the last
+    sync instead of re-listing the whole repository.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sync_state)")}
+        if "listing" not in columns:
+            # Stores from before listing bounds were recorded; their next sync lists in full.
+            with self._conn:
+                self._conn.execute("ALTER TABLE sync_state ADD COLUMN listing TEXT")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(issues)")}
+        if "labels" not in columns:
+            # Rows from before labels were kept match no label or reaction filter
+            # until a full listing (forced by forgetting the bounds) refreshes them.
+            with self._conn:
+                self._conn.execute("ALTER TABLE issues ADD COLUMN labels TEXT")
+                self._conn.execute("ALTER TABLE issues ADD COLUMN reaction_count INTEGER")
+                self._conn.execute("UPDATE sync_state SET listing = NULL")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def last_synced(self, owner: str, repo: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT last_synced_at FROM sync_state WHERE owner = ? AND repo = ?",
+            (owner, repo),
+        ).fetchone()
+        return row[0] if row else None
+
+    def listing_bounds(self, owner: str, repo: str) -> Optional[Dict[str, Any]]:
+        """State, ``max_issues`` and filter of the last full listing, if recorded."""
+        row = self._conn.execute(
+            "SELECT listing FROM sync_state WHERE owner = ? AND repo = ?",
+            (owner, repo),
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def set_last_synced(
+        self,
+        owner: str,
+        repo: str,
+        timestamp: str,
+        listing: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record a sync; ``listing`` replaces the recorded bounds when given."""
+        listing = listing if listing is not None else self.listing_bounds(owner, repo)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (owner, repo, last_synced_at, listing) VALUES (?, ?, ?, ?)",
+                (owner, repo, timestamp, json.dumps(listing) if listing is not None else None),
+            )
+
+    def upsert_issues(self, owner: str, repo: str, issues: Iterable[Issue]) -> None:
+        """Insert or update issue rows; stored comments are left untouched."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO issues "
+                "(owner, repo, number, id, title, body, state, html_url, user, created_at, updated_at, "
+                "labels, reaction_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        owner,
+                        repo,
+                        i.number,
+                        i.id,
+                        i.title,
+                        i.body,
+                        i.state,
+                        i.html_url,
+                        i.user,
+                        i.created_at,
+                        i.updated_at,
+                        json.dumps(i.labels) if i.labels is not None else None,
+                        i.reaction_count,
+                    )
+                    for i in issues
+                ],
+            )
+
+    def upsert_comments(
+        self,
+        owner: str,
+        repo: str,
+        comments_by_issue: Dict[int, List[IssueComment]],
+        replace: bool = False,
+    ) -> None:
+        """
+        Store comments grouped by issue number.
+
+        With ``replace=True`` the given lists become the complete comment
+        threads of those issues; otherwise comments are merged by ID.
+        """
+        with self._conn:
+            for number, comments in comments_by_issue.items():
+                if replace:
+                    self._conn.execute(
+                        "DELETE FROM comments WHERE owner = ? AND repo = ? AND number = ?",
+                        (owner, repo, number),
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO comments (id, owner, repo, number, body, user) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(c.id, owner, repo, number, c.body, c.user) for c in comments],
+                )
+
+    def comment_counts(self, owner: str, repo: str, numbers: Iterable[int]) -> Dict[int, int]:
+        """Stored comments per issue number (issues without comments are left out)."""
+        numbers = list(numbers)
+        if not numbers:
+            return {}
+        placeholders = ",".join("?" * len(numbers))
+        rows = self._conn.execute(
+            f"SELECT number, COUNT(*) FROM comments "
+            f"WHERE owner = ? AND repo = ? AND number IN ({placeholders}) GROUP BY number",
+            [owner, repo, *numbers],
+        )
+        return dict(rows.fetchall())
+
+    def known_issue_numbers(self, owner: str, repo: str) -> set[int]:
+        rows = self._conn.execute(
+            "SELECT number FROM issues WHERE owner = ? AND repo = ?",
+            (owner, repo),
+        )
+        return {row[0] for row in rows}
+
+    def load_issues(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "open",
+        max_issues: Optional[int] = 100,
+        issue_filter: Optional[IssueFilter] = None,
+    ) -> List[Issue]:
+        """
+        Return stored issues, newest first, with their comments attached.
+
+        ``issue_filter`` is evaluated against the stored rows, so a store
+        synced without (or with other) filters still yields only the
+        matching issues. The comment condition counts stored comments.
+        """
+        query = (
+            "SELECT id, number, title, body, state, html_url, user, created_at, updated_at, "
+            "labels, reaction_count FROM issues WHERE owner = ? AND repo = ?"
+        )
+        params: list = [owner, repo]
+        if state != "all":
+            query += " AND state = ?"
+            params.append(state)
+        if issue_filter is not None:
+            conditions, values = _filter_sql(issue_filter)
+            query += "".join(f" AND {c}" for c in conditions)
+            params.extend(values)
+        query += " ORDER BY number DESC"
+        if max_issues is not None:
+            query += " LIMIT ?"
+            params.append(max_issues)
+
+        issues = [
+            Issue(
+                id=row[0],
+                number=row[1],
+                title=row[2],
+                body=row[3],
+                state=row[4],
+                html_url=row[5],
+                user=row[6],
+                comments=[],
+                created_at=row[7],
+                updated_at=row[8],
+                labels=json.loads(row[9]) if row[9] is not None else None,
+                reaction_count=row[10],
+            )
+            for row in self._conn.execute(query, params)
+        ]
+        by_number = {i.number: i for i in issues}
+        if by_number:
+            placeholders = ",".join("?" * len(by_number))
+            rows = self._conn.execute(
+                f"SELECT number, id, body, user FROM comments "
+                f"WHERE owner = ? AND repo = ? AND number IN ({placeholders}) ORDER BY id",
+                [owner, repo, *by_number],
+            )
+            for number, cid, body, user in rows:
+                by_number[number].comments.append(IssueComment(id=cid, body=body, user=user))
+        for issue in issues:
+            issue.comment_count = len(issue.comments)
+        return issues
+
+
+def sync_repository(
+    client: GitHubClient,
+    store: IssueStore,
+    owner: str,
+    repo: str,
+    state: str = "open",
+    max_issues: int = 100,
+    issue_filter: Optional[IssueFilter] = None,
+) -> int:
+    """
+    Bring the local store up to date with GitHub and return how many
+    issues were fetched.
+
+    A full listing (bounded by ``max_issues``) runs on the first sync and
+    whenever ``state``, ``max_issues`` or ``issue_filter`` reach beyond the
+    recorded bounds of the last full listing, e.g. a larger ``max_issues``
+    or ``state="all"`` after ``"open"``. Otherwise only issues updated
+    since the previous sync are listed (``since`` + ``sort=updated``,
+    across all states so closures are seen, and unfiltered so an issue
+    that stops matching ``issue_filter`` is updated too), plus comments
+    created or edited in that window. Threads whose stored comment count
+    no longer matches GitHub's are fetched again in full, which drops
+    deleted comments. Issues stored by earlier syncs stay; pass the
+    filter to ``IssueStore.load_issues`` to read only matching ones.
+    """
+    # Taken before fetching so changes made during the sync are picked up next time.
+    started_at = _utc_now()
+    since = store.last_synced(owner, repo)
+    wanted = _listing_bounds(state, max_issues, issue_filter)
+    listed = store.listing_bounds(owner, repo)
+    full_listing = since is None or listed is None or not _covers(listed, wanted)
+
+    if full_listing:
+        issues = client.list_issues(
+            owner, repo, state=state, max_issues=max_issues, issue_filter=issue_filter
+        )
+        issues = client.fetch_comments_for_issues(owner, repo, issues)
+        store.upsert_issues(owner, repo, issues)
+        store.upsert_comments(
+            owner, repo, {i.number: i.comments or [] for i in issues}, replace=True
+        )
+    else:
+        issues = client.list_issues(
+            owner,
+            repo,
+            state="all",
+            max_issues=None,
+            since=since,
+            sort="updated",
+        )
+        store.upsert_issues(owner, repo, issues)
+        known = store.known_issue_numbers(owner, repo)
+        comments = client.list_comments_since(owner, repo, since)
+        store.upsert_comments(
+            owner, repo, {n: cs for n, cs in comments.items() if n in known}
+        )
+        # New and edited comments are merged above; a deleted one only shows as a lower count.
+        stored = store.comment_counts(owner, repo, (i.number for i in issues))
+        stale = [
+            i
+            for i in issues
+            if i.comment_count is not None and i.comment_count != stored.get(i.number, 0)
+        ]
+        # The comments the listing returned stay attached: GraphQL continues a
+        # truncated thread after them, REST fetches the whole thread anyway.
+        if stale:
+            stale = client.fetch_comments_for_issues(owner, repo, stale)
+            store.upsert_comments(
+                owner, repo, {i.number: i.comments or [] for i in stale}, replace=True
+            )
+
+    store.set_last_synced(owner, repo, started_at, listing=wanted if full_listing else None)
+    return len(issues)
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Characters that matter inside an object, and inside a string literal.
+_STRUCTURAL = re.compile(r'[{}"]')
+_STRING_END = re.compile(r'["\\]')
+_FENCE_OPEN = re.compile(r"```json[ \t]*\r?\n", re.IGNORECASE)
+
+_DECODER = json.JSONDecoder()
+
+Validator = Callable[[Dict[str, Any]], bool]
+
+
+class JSONObjectScanner:
+    """
+    Incremental, string-aware brace matcher for JSON objects embedded in text.
+
+    ``feed`` accepts text in arbitrary pieces (e.g. streamed completion
+    deltas) and returns the source of every top-level ``{...}`` that closed
+    in it. Scanning jumps between structural characters with compiled
+    regexes, so each character is looked at once and the total cost is
+    linear in the input. Prose outside objects is discarded as soon as it
+    is scanned; only the currently open object is buffered.
+
+    A stray ``{`` in the surrounding prose never closes, which would hide
+    any object after it. Objects nested under such an unmatched brace are
+    kept and returned by ``close`` (outermost ones only).
+    """
+
+    def __init__(self) -> None:
+        self._chunks: Deque[str] = deque()
+        # Absolute offset of ``_chunks[0]`` and of the end of the scanned text.
+        self._offset = 0
+        self._end = 0
+        # Absolute offsets of the currently open braces.
+        self._stack: List[int] = []
+        self._in_string = False
+        self._escape = False
+        # Closed objects below an unmatched brace, outermost only, in order.
+        self._pending: List[Tuple[int, int]] = []
+
+    def _text(self, start: int, end: int) -> str:
+        joined = "".join(self._chunks)
+        return joined[start - self._offset : end - self._offset]
+
+    def feed(self, text: str) -> List[str]:
+        """Scan ``text`` and return the top-level objects completed by it."""
+        found: List[str] = []
+        if not text:
+            return found
+        base = self._end
+        self._chunks.append(text)
+        self._end += len(text)
+        stack = self._stack
+        i, n = 0, len(text)
+        if self._escape:
+            self._escape = False
+            i = 1
+
+        while i < n:
+            if self._in_string:
+                m = _STRING_END.search(text, i)
+                if m is None:
+                    break
+                j = m.start()
+                if text[j] == "\\":
+                    if j + 1 >= n:
+                        self._escape = True
+                    i = j + 2
+                    continue
+                self._in_string = False
+                i = j + 1
+                continue
+
+            if not stack:
+                # Outside any object only an opening brace matters.
+                j = text.find("{", i)
+                if j < 0:
+                    break
+                stack.append(base + j)
+                i = j + 1
+                continue
+
+            m = _STRUCTURAL.search(text, i)
+            if m is None:
+                break
+            j = m.start()
+            char = text[j]
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                stack.append(base + j)
+            else:
+                start, end = stack.pop(), base + j + 1
+                if not stack:
+                    found.append(self._text(start, end))
+                    self._pending.clear()
+                else:
+                    # Spans are ordered by start, so those inside this one are at the tail.
+                    while self._pending and self._pending[-1][0] > start:
+                        self._pending.pop()
+                    self._pending.append((start, end))
+            i = j + 1
+
+        self._trim()
+        return found
+
+    def _trim(self) -> None:
+        # Keep text from the outermost open brace on; drop everything before it.
+        if not self._stack:
+            self._chunks.clear()
+            self._offset = self._end
+            return
+        while self._offset + len(self._chunks[0]) <= self._stack[0]:
+            self._offset += len(self._chunks.popleft())
+
+    def close(self) -> List[str]:
+        """Finish the input and return closed objects hidden by unmatched braces."""
+        joined = "".join(self._chunks)
+        found = [joined[start - self._offset : end - self._offset] for start, end in self._pending]
+        self._pending.clear()
+        self._stack.clear()
+        self._chunks.clear()
+        self._offset = self._end
+        self._in_string = self._escape = False
+        return found
+
+
+def iter_json_objects(text: str) -> Iterator[str]:
+    """Yield the source text of each top-level JSON object candidate in ``text``."""
+    scanner = JSONObjectScanner()
+    yield from scanner.feed(text)
+    yield from scanner.close()
+
+
+def _object_end(text: str, start: int) -> Optional[int]:
+    """Index just past the brace matching ``text[start]``, or None if it never closes."""
+    depth, i, n = 0, start, len(text)
+    while i < n:
+        m = _STRUCTURAL.search(text, i)
+        if m is None:
+            return None
+        j = m.start()
+        if text[j] == '"':
+            # Skip the string literal, honouring escapes.
+            i = j + 1
+            while True:
+                m = _STRING_END.search(text, i)
+                if m is None:
+                    return None
+                if text[m.start()] == "\\":
+                    i = m.start() + 2
+                    continue
+                i = m.end()
+                break
+            continue
+        depth += 1 if text[j] == "{" else -1
+        if depth == 0:
+            return j + 1
+        i = j + 1
+    return None
+
+
+def _fenced_blocks(text: str) -> Iterator[str]:
+    """Yield the bodies of ```json fenced blocks, in order."""
+    for match in _FENCE_OPEN.finditer(text):
+        end = text.find("```", match.end())
+        yield text[match.end() : end if end >= 0 else len(text)]
+
+
+def _accept(candidate: str, validate: Optional[Validator], errors: List[str]) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(candidate)
+    except ValueError as exc:
+        errors.append(str(exc))
+        return None
+    if not isinstance(data, dict):
+        return None
+    if validate is not None and not validate(data):
+        errors.append("object does not match the expected schema")
+        return None
+    return data
+
+
+def _no_match(errors: List[str]) -> ValueError:
+    if errors:
+        return ValueError(f"Failed to parse JSON from LLM output: {errors[-1]}")
+    return ValueError("No JSON object found in LLM output.")
+
+
+def extract_json_object(text: str, validate: Optional[Validator] = None) -> Dict[str, Any]:
+    """
+    Return the first JSON object in ``text`` that parses and passes ``validate``.
+
+    Objects inside ```json fences are tried first, so braces and quotes in
+    the surrounding prose cannot derail them; then the whole text is
+    scanned. Raises ValueError when no candidate qualifies.
+    """
+    errors: List[str] = []
+    for source in (*_fenced_blocks(text), text):
+        data = _first_object(source, validate, errors)
+        if data is not None:
+            return data
+    raise _no_match(errors)
+
+
+def _first_object(text: str, validate: Optional[Validator], errors: List[str]) -> Optional[Dict[str, Any]]:
+    # Fast path: the C decoder parses well-formed objects in place. Only a
+    # span it rejects is brace-matched in Python to find where to resume,
+    # so every character is still visited a bounded number of times.
+    pos = 0
+    while True:
+        start = text.find("{", pos)
+        if start < 0:
+            return None
+        try:
+            data, end = _DECODER.raw_decode(text, start)
+        except ValueError as exc:
+            errors.append(str(exc))
+            end = _object_end(text, start)
+            if end is None:
+                # An unmatched brace: the candidates are the objects nested under it.
+                for candidate in iter_json_objects(text[start + 1 :]):
+                    data = _accept(candidate, validate, errors)
+                    if data is not None:
+                        return data
+                return None
+        else:
+            if isinstance(data, dict) and (validate is None or validate(data)):
+                return data
+            errors.append("object does not match the expected schema")
+        pos = end
+
+
+def extract_json_object_from_stream(
+    chunks: Iterable[str],
+    validate: Optional[Validator] = None,
+) -> Dict[str, Any]:
+    """
+    Like ``extract_json_object`` for text arriving in pieces.
+
+    Each candidate is parsed as soon as its closing brace arrives, and the
+    first valid object is returned without waiting for (or consuming) the
+    rest of ``chunks``. If nothing qualifies by the end, the full text gets
+    the fence-aware pass of ``extract_json_object`` (a truncated first
+    attempt can leave the incremental scanner out of step).
+    """
+    scanner = JSONObjectScanner()
+    errors: List[str] = []
+    received: List[str] = []
+    for chunk in chunks:
+        received.append(chunk)
+        for candidate in scanner.feed(chunk):
+            data = _accept(candidate, validate, errors)
+            if data is not None:
+                return data
+    for candidate in scanner.close():
+        data = _accept(candidate, validate, errors)
+        if data is not None:
+            return data
+    return extract_json_object("".join(received), validate)
+
+
+_SECTION_TOKENS = re.compile(r'[{}\[\]",]')
+
+
+class SectionStreamParser:
+    """
+    Incrementally parse the top-level arrays of a streamed JSON object.
+
+    ``feed`` takes completion pieces as they arrive. Every element of a
+    top-level array (``"pain_points": [...]``) is decoded as soon as it
+    closes and appended to ``items[section]``; ``feed`` returns the
+    sections whose array closed in that piece, with their elements. Only
+    the element currently being received is buffered.
+
+    The first object that contains an array is taken as the root; the
+    final, authoritative result should still come from
+    ``extract_json_object`` on the full text.
+    """
+
+    def __init__(self, sections: Optional[Iterable[str]] = None) -> None:
+        # Top-level keys to collect; None collects every array.
+        self.sections = set(sections) if sections is not None else None
+        self.items: Dict[str, List[Any]] = {}
+        self._depth = 0
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key: Optional[str] = None
+        # The array being collected, if its key is wanted.
+        self._section: Optional[str] = None
+        # Text of the value being captured (a key or an array element).
+        self._capture: Optional[List[str]] = None
+        self._capture_from = 0
+        self._capture_is_key = False
+
+    def _start_capture(self, index: int, is_key: bool = False) -> None:
+        self._capture = []
+        self._capture_from = index
+        self._capture_is_key = is_key
+
+    def _end_capture(self, text: str, end: int) -> None:
+        assert self._capture is not None
+        raw = "".join(self._capture) + text[self._capture_from : end]
+        self._capture = None
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        if self._capture_is_key:
+            self._key = value if isinstance(value, str) else None
+        elif self._section is not None:
+            self.items[self._section].append(value)
+
+    def feed(self, text: str) -> List[Tuple[str, List[Any]]]:
+        """Scan ``text`` and return ``(section, elements)`` for each array that closed."""
+        completed: List[Tuple[str, List[Any]]] = []
+        i, n = 0, len(text)
+        if self._done or not text:
+            return completed
+        if self._escape:
+            self._escape = False
+            i = 1
+
+        while i < n:
+            if self._in_string:
+                m = _STRING_END.search(text, i)
+                if m is None:
+                    break
+                j = m.start()
+                if text[j] == "\\":
+                    if j + 1 >= n:
+                        self._escape = True
+                    i = j + 2
+                    continue
+                self._in_string = False
+                if self._capture is not None and self._depth <= 2:
+                    # A key (depth 1) or a string element of a collected array.
+                    self._end_capture(text, j + 1)
+                    if self._capture_is_key:
+                        self._expect_key = False
+                i = j + 1
+                continue
+
+            if self._depth == 0:
+                j = text.find("{", i)
+                if j < 0:
+                    break
+                self._depth, self._expect_key = 1, True
+                i = j + 1
+                continue
+
+            m = _SECTION_TOKENS.search(text, i)
+            if m is None:
+                break
+            j = m.start()
+            char = text[j]
+            depth = self._depth
+            if char == '"':
+                self._in_string = True
+                if depth == 1 and self._expect_key:
+                    self._start_capture(j, is_key=True)
+                elif depth == 2 and self._section is not None:
+                    self._start_capture(j)
+            elif char in "{[":
+                if depth == 1 and char == "[" and self._key is not None:
+                    if self.sections is None or self._key in self.sections:
+                        self._section = self._key
+                        self.items[self._section] = []
+                elif depth == 2 and self._section is not None:
+                    self._start_capture(j)
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._capture is not None:
+                    self._end_capture(text, j + 1)
+                elif self._depth == 1 and self._section is not None:
+                    completed.append((self._section, self.items[self._section]))
+                    self._section = None
+                elif self._depth == 0:
+                    # A brace pair in leading prose has no arrays; keep looking.
+                    if self.items:
+                        self._done = True
+                        break
+                    self._key = None
+            elif char == "," and depth == 1:
+                self._expect_key = True
+                self._key = None
+            i = j + 1
+
+        if self._capture is not None:
+            self._capture.append(text[self._capture_from :])
+            self._capture_from = 0
+        return completed
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import json
 import os
-import re
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
-from openai import OpenAI
+from .cache import DiskCache, LayeredCache
+from .json_extract import Validator, extract_json_object
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
 class LLMClient:
@@ -22,6 +27,10 @@ class LLMClient:
         api_key: Optional[str] = None,
         model: str = "gpt-4.1-mini",
         base_url: Optional[str] = None,
+        temperature: float = 0.2,
+        cache: Optional[DiskCache | LayeredCache] = None,
+        metrics: Optional[Metrics] = None,
+        max_retries: int = 2,
     ) -> None:
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -29,45 +38,148 @@ class LLMClient:
                 "OPENAI_API_KEY is not set. Please set it in your environment or .env file."
             )
 
-        client_kwargs: Dict[str, Any] = {"api_key": api_key}
+        self._client_kwargs: Dict[str, Any] = {"api_key": api_key}
         if base_url:
-            client_kwargs["base_url"] = base_url
-
-        self._client = OpenAI(**client_kwargs)
+            self._client_kwargs["base_url"] = base_url
+        # Importing openai costs more than the rest of the CLI together, so the
+        # SDK client is only built for the first request that misses the cache.
+        self._openai: Optional[OpenAI] = None
+        self._client_lock = threading.Lock()
         self.model = model
+        self.temperature = temperature
+        # Retries inside the SDK. Set to 0 behind an LLMScheduler, which
+        # retries itself; SDK retries would multiply its attempts and
+        # bypass its rate limits.
+        self.max_retries = max_retries
+        # Optional content-addressed store of completions; identical requests
+        # are answered locally instead of calling the API again.
+        self.cache = cache
+        # Optional per-call accounting: latency and prompt/completion tokens.
+        self.metrics = metrics
+
+    @property
+    def _client(self) -> OpenAI:
+        if self._openai is None:
+            with self._client_lock:
+                if self._openai is None:
+                    from openai import OpenAI
+
+                    self._openai = OpenAI(max_retries=self.max_retries, **self._client_kwargs)
+        return self._openai
+
+    def _cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        return DiskCache.make_key("chat", self.model, system_prompt, user_prompt, self.temperature)
+
+    def cached_response(self, system_prompt: str, user_prompt: str) -> Optional[str]:
+        """Return the cached completion for this exact request, if any."""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self._cache_key(system_prompt, user_prompt))
+        if not isinstance(cached, str):
+            return None
+        if self.metrics is not None:
+            self.metrics.inc("llm_cache_hits_total")
+        return cached
 
     def chat(self, system_prompt: str, user_prompt: str) -> str:
-        resp = self._client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.2,
-        )
+        cached = self.cached_response(system_prompt, user_prompt)
+        if cached is not None:
+            return cached
+
+        start = time.monotonic()
+        try:
+            resp = self._client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=self.temperature,
+            )
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.inc("llm_errors_total")
+            raise
+        if self.metrics is not None:
+            self._record_call(getattr(resp, "usage", None), time.monotonic() - start)
         content = resp.choices[0].message.content or ""
+        if self.cache is not None and content:
+            self.cache.set(self._cache_key(system_prompt, user_prompt), content)
         return content
 
-    @staticmethod
-    def extract_json_from_markdown(markdown_text: str) -> Dict[str, Any]:
+    def chat_stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
         """
-        Extract the first JSON object from a Markdown string that may contain ```json blocks.
+        Like ``chat`` but yield the completion in pieces as they arrive.
+
+        The full text is cached once the stream ends; a cache hit yields the
+        whole cached completion at once.
         """
-        # Look for ```json ... ``` first
-        code_block_match = re.search(
-            r"```json\s*(\{.*?\})\s*```", markdown_text, flags=re.DOTALL | re.IGNORECASE
-        )
-        raw = code_block_match.group(1) if code_block_match else markdown_text
+        cached = self.cached_response(system_prompt, user_prompt)
+        if cached is not None:
+            yield cached
+            return
 
-        # Fallback: try to find first {...} JSON object if parsing fails
+        start = time.monotonic()
+        parts: List[str] = []
+        usage: Any = None
         try:
-            return json.loads(raw)
+            stream = self._client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=self.temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                for choice in chunk.choices:
+                    delta = choice.delta.content if choice.delta else None
+                    if not delta:
+                        continue
+                    if not parts and self.metrics is not None:
+                        self.metrics.observe("llm_first_token_seconds", time.monotonic() - start)
+                    parts.append(delta)
+                    yield delta
         except Exception:
-            brace_match = re.search(r"(\{.*\})", markdown_text, flags=re.DOTALL)
-            if brace_match:
-                try:
-                    return json.loads(brace_match.group(1))
-                except Exception as exc:  # pragma: no cover - best-effort parsing
-                    raise ValueError(f"Failed to parse JSON from LLM output: {exc}") from exc
-            raise ValueError("No JSON object found in LLM output.")
+            if self.metrics is not None:
+                self.metrics.inc("llm_errors_total")
+            raise
+        if self.metrics is not None:
+            self._record_call(usage, time.monotonic() - start)
+        content = "".join(parts)
+        if self.cache is not None and content:
+            self.cache.set(self._cache_key(system_prompt, user_prompt), content)
+
+    def _record_call(self, usage: Any, elapsed: float) -> None:
+        assert self.metrics is not None
+        self.metrics.inc("llm_requests_total")
+        self.metrics.observe("llm_request_seconds", elapsed)
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        self.metrics.inc("llm_prompt_tokens_total", prompt_tokens)
+        self.metrics.inc("llm_completion_tokens_total", completion_tokens)
+        # Prompt tokens the provider served from its prefix cache.
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        self.metrics.inc("llm_cached_prompt_tokens_total", cached_tokens)
+        self.metrics.observe("llm_prompt_tokens", prompt_tokens)
+        self.metrics.observe("llm_completion_tokens", completion_tokens)
 
+    @staticmethod
+    def extract_json_from_markdown(
+        markdown_text: str,
+        validate: Optional[Validator] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract the first JSON object from a Markdown string that may contain ```json blocks.
+
+        ``validate`` rejects objects of the wrong shape so extraction moves
+        on to the next candidate.
+        """
+        return extract_json_object(markdown_text, validate)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Iterator, Optional
+
+from .llm import LLMClient
+from .tokens import estimate_tokens
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at ``rate_per_minute``.
+
+    A request larger than the bucket's capacity waits for a full bucket and
+    then drives the level negative, so oversized prompts still go through
+    but delay whatever comes after them.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate_per_minute / 60.0
+        # Default burst: ten seconds' worth of budget.
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate * 10)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill_locked(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> None:
+        need = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill_locked()
+                if self._level >= need:
+                    self._level -= amount
+                    return
+                wait = (need - self._level) / self.rate
+            time.sleep(wait)
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(exc: Exception) -> bool:
+    # Only reached after a request failed, so openai is already loaded.
+    import openai
+
+    if isinstance(exc, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+class LLMScheduler:
+    """
+    Runs chat requests against an ``LLMClient`` with bounded concurrency.
+
+    Requests are paced by optional requests-per-minute and tokens-per-minute
+    buckets and retried with jittered exponential backoff on 429, 5xx and
+    connection errors, so ``llm_client`` should be built with
+    ``max_retries=0``. Cached responses bypass the limits entirely. Callers
+    bring their own threads (``DemandExtractor`` runs a pool); the
+    scheduler only bounds how many of them talk to the API at once.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ) -> None:
+        self.llm = llm_client
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def chat(self, system_prompt: str, user_prompt: str) -> str:
+        """Blocking chat call that honours the scheduler's limits."""
+        cached = self.llm.cached_response(system_prompt, user_prompt)
+        if cached is not None:
+            return cached
+
+        with self._slots:
+            for attempt in range(self.max_retries + 1):
+                self._pace(system_prompt, user_prompt)
+                try:
+                    return self.llm.chat(system_prompt, user_prompt)
+                except Exception as exc:
+                    if attempt >= self.max_retries or not _is_retryable(exc):
+                        raise
+                    self._backoff(exc, attempt)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def chat_stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """
+        Streaming counterpart of ``chat``.
+
+        Only failures before the first piece arrives are retried; once text
+        has been yielded an error propagates to the caller. The concurrency
+        slot is held until the stream is exhausted or closed.
+        """
+        cached = self.llm.cached_response(system_prompt, user_prompt)
+        if cached is not None:
+            yield cached
+            return
+
+        with self._slots:
+            for attempt in range(self.max_retries + 1):
+                self._pace(system_prompt, user_prompt)
+                started = False
+                try:
+                    for piece in self.llm.chat_stream(system_prompt, user_prompt):
+                        started = True
+                        yield piece
+                    return
+                except Exception as exc:
+                    if started or attempt >= self.max_retries or not _is_retryable(exc):
+                        raise
+                    self._backoff(exc, attempt)
+
+    def _pace(self, system_prompt: str, user_prompt: str) -> None:
+        if self._requests is not None:
+            self._requests.acquire()
+        if self._tokens is not None:
+            self._tokens.acquire(estimate_tokens(system_prompt) + estimate_tokens(user_prompt))
+
+    def _backoff(self, exc: Exception, attempt: int) -> None:
+        delay = _retry_after(exc)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        time.sleep(delay)
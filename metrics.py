@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from .fileio import atomic_write
+
+
+PROMETHEUS_PREFIX = "demandlens_"
+
+
+@dataclass(slots=True)
+class Summary:
+    """Count, sum and maximum of an observed value (latency, tokens per call, ...)."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+
+class Metrics:
+    """
+    Thread-safe counters, gauges, per-call summaries and stage timings for one run.
+
+    Clients record into the instance they are given; the CLI prints a short
+    summary at the end and can export everything with ``write``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.summaries: Dict[str, Summary] = {}
+        # Wall time per pipeline stage; stages of concurrent repositories add up.
+        self.stages: Dict[str, float] = {}
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self.summaries.setdefault(name, Summary()).add(value)
+
+    def count(self, name: str) -> float:
+        with self._lock:
+            return self.counters.get(name, 0)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the wall time of the ``with`` block to stage ``name``."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration_seconds": round(time.monotonic() - self._started, 3),
+                "stages": {k: round(v, 3) for k, v in self.stages.items()},
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "summaries": {
+                    name: {
+                        "count": s.count,
+                        "sum": round(s.total, 3),
+                        "max": round(s.max, 3),
+                        "mean": round(s.total / s.count, 3) if s.count else 0.0,
+                    }
+                    for name, s in self.summaries.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        data = self.to_dict()
+        lines = [
+            f"# TYPE {PROMETHEUS_PREFIX}run_duration_seconds gauge",
+            f"{PROMETHEUS_PREFIX}run_duration_seconds {data['duration_seconds']}",
+            f"# TYPE {PROMETHEUS_PREFIX}stage_duration_seconds gauge",
+        ]
+        for stage, seconds in sorted(data["stages"].items()):
+            lines.append(f'{PROMETHEUS_PREFIX}stage_duration_seconds{{stage="{stage}"}} {seconds}')
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} counter")
+            lines.append(f"{PROMETHEUS_PREFIX}{name} {value:g}")
+        for name, value in sorted(data["gauges"].items()):
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} gauge")
+            lines.append(f"{PROMETHEUS_PREFIX}{name} {value:g}")
+        for name, s in sorted(data["summaries"].items()):
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} summary")
+            lines.append(f"{PROMETHEUS_PREFIX}{name}_count {s['count']}")
+            lines.append(f"{PROMETHEUS_PREFIX}{name}_sum {s['sum']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the metrics to ``path``: a Prometheus textfile for ``.prom``,
+        JSON otherwise. The file is replaced atomically so collectors never
+        read a partial export.
+        """
+        path = Path(path)
+        if path.suffix == ".prom":
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.to_dict(), indent=2) + "\n"
+        atomic_write(path, text)
+
+    def format_summary(self) -> str:
+        """One-line human-readable digest of the run."""
+        with self._lock:
+            c = dict(self.counters)
+            duration = time.monotonic() - self._started
+        return (
+            f"{c.get('github_requests_total', 0):g} GitHub requests "
+            f"({c.get('github_cache_hits_total', 0):g} cached, "
+            f"{c.get('github_response_bytes_total', 0) / (1024 * 1024):.1f} MiB), "
+            f"{c.get('llm_requests_total', 0):g} LLM calls "
+            f"({c.get('llm_cache_hits_total', 0):g} cached, "
+            f"{c.get('llm_prompt_tokens_total', 0):g} prompt / "
+            f"{c.get('llm_completion_tokens_total', 0):g} completion tokens, "
+            f"{c.get('llm_cached_prompt_tokens_total', 0):g} prompt tokens prefix-cached) "
+            f"in {duration:.1f}s"
+        )
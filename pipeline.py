@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterator, List, Optional
+
+from .github_client import GitHubClient, Issue, IssueFilter
+from .issue_parser import IssueText, issue_to_text
+
+
+# Listing pages allowed in flight per comment worker before the listing
+# waits for the oldest issues to complete.
+PENDING_PAGES_PER_WORKER = 2
+# Largest page the issue listings return.
+_PAGE_SIZE = 100
+
+
+def stream_issue_texts(
+    client: GitHubClient,
+    owner: str,
+    repo: str,
+    state: str = "open",
+    max_issues: Optional[int] = 100,
+    sink: Optional[Callable[[Issue], None]] = None,
+    issue_filter: Optional[IssueFilter] = None,
+) -> Iterator[IssueText]:
+    """
+    Yield ``IssueText`` records while the repository is still being fetched.
+
+    Each listing page is handed to a comment-fetching pool as soon as it
+    arrives, and issues are yielded in listing order as their comments
+    complete. Feeding this generator to ``DemandExtractor.analyze`` in
+    chunked mode overlaps GitHub requests with LLM calls, and only the
+    issues in flight are held in memory: when comment fetching falls
+    behind the listing, listing pauses at ``PENDING_PAGES_PER_WORKER``
+    pages per worker until the oldest issues complete. ``sink``, if
+    given, receives each completed ``Issue`` in order (e.g.
+    ``CorpusWriter.write``).
+    """
+    workers = max(1, client.max_workers)
+    max_pending = PENDING_PAGES_PER_WORKER * workers * _PAGE_SIZE
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Deque["Future[List[Issue]]"] = deque()
+        pages = client.iter_issue_pages(
+            owner, repo, state=state, max_issues=max_issues, issue_filter=issue_filter
+        )
+        for page in pages:
+            for issue in page:
+                while len(pending) >= max_pending:
+                    yield _complete(pending.popleft(), sink)
+                pending.append(
+                    pool.submit(client.fetch_comments_for_issues, owner, repo, [issue], 1)
+                )
+            while pending and pending[0].done():
+                yield _complete(pending.popleft(), sink)
+        while pending:
+            yield _complete(pending.popleft(), sink)
+
+
+def _complete(future: "Future[List[Issue]]", sink: Optional[Callable[[Issue], None]]) -> IssueText:
+    issue = future.result()[0]
+    if sink is not None:
+        sink(issue)
+    return issue_to_text(issue)
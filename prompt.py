@@ -23,15 +23,135 @@ SYSTEM_PROMPT = dedent(
 ).strip()
 
 
-def build_user_prompt(issue_blocks: str) -> str:
+_OUTPUT_SPEC = dedent(
     """
-    Build the user message for the LLM.
+    Use the following JSON schema for your final answer (wrap it in a Markdown code block):
 
-    The model is instructed to output a JSON object embedded in Markdown,
-    so that it's easy to parse while still being human-readable.
+    ```json
+    {
+      "overview": [
+        "string"
+      ],
+      "pain_points": [
+        {
+          "id": "pp_1",
+          "summary": "short human-friendly description of the pain point",
+          "evidence_issue_numbers": [1, 2, 5],
+          "why_it_matters": "why this pain is important from user/product perspective",
+          "priority": "High | Medium | Low"
+        }
+      ],
+      "merged_feature_requests": [
+        {
+          "id": "fr_1",
+          "summary": "merged feature / solution idea that addresses one or more pain points",
+          "related_pain_point_ids": ["pp_1", "pp_3"],
+          "priority": "High | Medium | Low",
+          "notes": "implementation hints or constraints if present in issues"
+        }
+      ],
+      "roadmap": [
+        {
+          "step": 1,
+          "title": "short phase title",
+          "related_feature_request_ids": ["fr_1", "fr_2"],
+          "rationale": "why this step comes at this stage"
+        }
+      ]
+    }
+    ```
+
+    - Make sure `priority` is always exactly one of: `High`, `Medium`, `Low`.
+    - Reuse `pain_points` across `merged_feature_requests` and `roadmap` by IDs.
+    - Focus on **user value**, not internal technical refactors unless explicitly requested by users.
+
+    Field guidelines:
+
+    - `overview`: each bullet is one sentence about what users are trying to do and where they
+      get stuck, not a list of features. Mention how widespread a theme is when the issues show it.
+    - `pain_points[].summary`: one sentence from the user's point of view (e.g. "Users cannot
+      resume an interrupted import"), naming the concrete workflow, platform or component
+      affected. Do not describe the fix here.
+    - `pain_points[].evidence_issue_numbers`: only numbers of issues that appear in the input,
+      in ascending order and without duplicates. An issue may support several pain points.
+    - `pain_points[].why_it_matters`: the consequence for users, such as lost work, a blocked
+      upgrade, a manual workaround or confusion for newcomers, and who is affected.
+    - `pain_points[].priority`: weigh how many distinct issues and commenters report the
+      problem, its severity (data loss, crashes, security and blocked usage before problems
+      with a workaround, and those before cosmetic ones) and whether reports are recent.
+    - `merged_feature_requests[].summary`: the capability users need, phrased as an outcome.
+      Combine requests that would solve the same problem even if users proposed different
+      solutions.
+    - `merged_feature_requests[].related_pain_point_ids`: at least one existing pain point ID.
+    - `merged_feature_requests[].notes`: constraints stated in the issues (compatibility,
+      platforms, configuration, performance limits); use an empty string if there are none.
+    - `roadmap`: 3–6 steps numbered from 1 without gaps. Put high-priority work and
+      prerequisites first; each feature request belongs to at most one step.
+
+    Reading the issues:
+
+    - Treat "+1" comments and reactions as evidence of how many users are affected, not as
+      separate needs.
+    - Support questions, spam, bot-generated reports (dependency updates, CI failures) and
+      release-tracking issues are not needs by themselves; use them only if they reveal an
+      underlying problem users keep running into.
+    - When an issue mixes several problems, attribute it to each relevant pain point.
+    - Quote or paraphrase user wording where it makes a pain point concrete; never invent
+      details, issue numbers or users.
+
+    Example of well-formed entries (illustrative only; do not reuse its issue numbers or wording):
+
+    ```json
+    {
+      "pain_points": [
+        {
+          "id": "pp_1",
+          "summary": "Users lose hours of progress when a large import fails halfway, because it always restarts from the beginning",
+          "evidence_issue_numbers": [12, 48, 103],
+          "why_it_matters": "Teams with big datasets cannot complete an import on unreliable networks and fall back to manual scripts",
+          "priority": "High"
+        }
+      ],
+      "merged_feature_requests": [
+        {
+          "id": "fr_1",
+          "summary": "Resumable imports that continue from the last completed batch",
+          "related_pain_point_ids": ["pp_1"],
+          "priority": "High",
+          "notes": "Issue 48 asks that it also work when the import is started from the CLI"
+        }
+      ],
+      "roadmap": [
+        {
+          "step": 1,
+          "title": "Make long imports reliable",
+          "related_feature_request_ids": ["fr_1"],
+          "rationale": "Most reported and blocks adoption by larger teams"
+        }
+      ]
+    }
+    ```
+
+    Avoid summaries such as "Improve import" or "Better performance": they do not say who is
+    affected or what goes wrong.
+
+    Before answering, check that every ID referenced in `related_pain_point_ids` and
+    `related_feature_request_ids` exists, that every pain point is addressed by at least one
+    feature request, and that the answer is a single valid JSON object.
     """
-    return dedent(
-        f"""
+).strip()
+
+
+# Every user prompt is a fixed prefix (output schema, then the task's
+# instructions) followed by the per-call content, so all calls of a kind
+# start with the same bytes and providers with prompt caching can reuse
+# them. Keep anything that varies between calls out of the prefixes.
+_RESPOND = "Produce the JSON as specified above, wrapped in a Markdown ```json code block."
+
+ANALYZE_PREFIX = (
+    f"{_OUTPUT_SPEC}\n\n"
+    + dedent(
+        """
         You are given a set of GitHub Issues (titles, bodies, and comments).
 
         Read all the issues carefully and then produce:
@@ -40,54 +160,122 @@ def build_user_prompt(issue_blocks: str) -> str:
         2. A list of **top user pain points** – distilled, non-duplicated problems.
         3. A set of **merged feature requests / opportunities** derived from those pain points.
         4. A suggested **implementation roadmap** ordered by priority.
+        """
+    ).strip()
+    + f"\n\n{_RESPOND}\n\n"
+    "Here are the GitHub Issues (one by one):\n\n"
+)
+
+
+def build_user_prompt(issue_blocks: str) -> str:
+    """
+    Build the user message for the LLM.
+
+    The model is instructed to output a JSON object embedded in Markdown,
+    so that it's easy to parse while still being human-readable.
+    """
+    return f"{ANALYZE_PREFIX}---\n{issue_blocks}\n---"
 
-        Use the following JSON schema for your final answer (wrap it in a Markdown code block):
-
-        ```json
-        {{
-          "overview": [
-            "string"
-          ],
-          "pain_points": [
-            {{
-              "id": "pp_1",
-              "summary": "short human-friendly description of the pain point",
-              "evidence_issue_numbers": [1, 2, 5],
-              "why_it_matters": "why this pain is important from user/product perspective",
-              "priority": "High | Medium | Low"
-            }}
-          ],
-          "merged_feature_requests": [
-            {{
-              "id": "fr_1",
-              "summary": "merged feature / solution idea that addresses one or more pain points",
-              "related_pain_point_ids": ["pp_1", "pp_3"],
-              "priority": "High | Medium | Low",
-              "notes": "implementation hints or constraints if present in issues"
-            }}
-          ],
-          "roadmap": [
-            {{
-              "step": 1,
-              "title": "short phase title",
-              "related_feature_request_ids": ["fr_1", "fr_2"],
-              "rationale": "why this step comes at this stage"
-            }}
-          ]
-        }}
-        ```
-
-        - Make sure `priority` is always exactly one of: `High`, `Medium`, `Low`.
-        - Reuse `pain_points` across `merged_feature_requests` and `roadmap` by IDs.
-        - Focus on **user value**, not internal technical refactors unless explicitly requested by users.
-
-        Here are the GitHub Issues (one by one):
-
-        ---
-        {issue_blocks}
-        ---
-
-        Now, produce the JSON as specified above, wrapped in a Markdown ```json code block.
+
+_DELTA_RULES = dedent(
+    """
+    Update the previous analysis with the new evidence:
+
+    1. Keep every existing pain point and feature request with its `id` unchanged. Revise its
+       summary, priority or notes only if the new evidence justifies it, and add new issue
+       numbers to its `evidence_issue_numbers`.
+    2. Add pain points and feature requests that no existing item covers, numbering them
+       after the highest existing ID (e.g. `pp_8` after `pp_7`).
+    3. Never renumber, reuse or delete IDs, never drop existing evidence and never invent
+       issue numbers.
+    4. Rewrite the overview (2–4 bullet points) and the roadmap for the updated set.
+    """
+).strip()
+
+DELTA_PREFIX = (
+    f"{_OUTPUT_SPEC}\n\n"
+    "You are given the previous analysis of a repository's GitHub Issues and the issues "
+    "that are new or have changed since it was produced.\n\n"
+    f"{_DELTA_RULES}\n\n{_RESPOND}\n\n"
+    "Here is the previous analysis:\n\n"
+)
+
+
+def build_delta_prompt(previous_analysis: str, issue_blocks: str) -> str:
+    """
+    Build the user message that folds new or changed issues into a previous analysis.
+
+    ``previous_analysis`` is the JSON result of an earlier run; its IDs
+    must survive so reports from consecutive runs can be compared.
+    """
+    return (
+        f"{DELTA_PREFIX}---\n{previous_analysis}\n---\n\n"
+        "Here are the new or changed GitHub Issues (one by one):\n\n"
+        f"---\n{issue_blocks}\n---"
+    )
+
+
+DELTA_REDUCE_PREFIX = (
+    f"{_OUTPUT_SPEC}\n\n"
+    "You are given the previous analysis of a repository's GitHub Issues and a separate "
+    "analysis of the issues that are new or have changed since then. The IDs of the "
+    "second analysis are unrelated to the previous one.\n\n"
+    f"{_DELTA_RULES}\n\n{_RESPOND}\n\n"
+    "Here is the previous analysis:\n\n"
+)
+
+
+def build_delta_reduce_prompt(previous_analysis: str, new_analysis: str) -> str:
+    """
+    Like ``build_delta_prompt`` when the new issues were too many for one
+    prompt and have already been analyzed (and merged) on their own.
+    """
+    return (
+        f"{DELTA_REDUCE_PREFIX}---\n{previous_analysis}\n---\n\n"
+        "Here is the analysis of the new or changed issues:\n\n"
+        f"---\n{new_analysis}\n---"
+    )
+
+
+REDUCE_PREFIX = (
+    f"{_OUTPUT_SPEC}\n\n"
+    + dedent(
+        """
+        You are given several partial analyses of GitHub Issues. Each one was produced
+        from a different subset of the same repository's issues, so their IDs overlap
+        and the same problem may appear in more than one of them.
+
+        Merge them into a single analysis:
+
+        1. Rewrite the overview (2–4 bullet points) to cover all subsets.
+        2. Merge pain points that describe the same underlying problem, keeping the union
+           of their `evidence_issue_numbers` and re-assessing priority across all evidence.
+        3. Merge feature requests the same way.
+        4. Produce one roadmap covering the merged feature requests.
+
+        Re-number IDs as `pp_1`, `pp_2`, ... and `fr_1`, `fr_2`, ... and update every
+        cross-reference to the new IDs. Never invent issue numbers.
         """
     ).strip()
+    + f"\n\n{_RESPOND}\n\n"
+    "Here are the partial analyses (one JSON object each):\n\n"
+)
+
+
+def build_reduce_prompt(partial_analyses: str) -> str:
+    """
+    Build the user message that merges several partial analyses into one.
+
+    ``partial_analyses`` holds the JSON results of analyzing disjoint
+    subsets of the same repository's issues.
+    """
+    return f"{REDUCE_PREFIX}---\n{partial_analyses}\n---"
+
 
+# The fixed prefix of each kind of user prompt, by builder.
+PROMPT_PREFIXES = {
+    "analyze": ANALYZE_PREFIX,
+    "reduce": REDUCE_PREFIX,
+    "delta": DELTA_PREFIX,
+    "delta_reduce": DELTA_REDUCE_PREFIX,
+}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+# Below this share of its hourly limit a token is paced so the rest of the
+# budget is spread over the time left until the window resets.
+DEFAULT_RESERVE_FRACTION = 0.1
+# Extra delay after X-RateLimit-Reset to absorb clock skew with GitHub.
+RESET_MARGIN = 1.0
+
+
+@dataclass(slots=True)
+class _Budget:
+    remaining: Optional[int] = None
+    limit: Optional[int] = None
+    # Epoch seconds at which the window resets.
+    reset: float = 0.0
+    # Monotonic time before which the next paced request may not start.
+    next_at: float = 0.0
+
+
+class RateLimitGovernor:
+    """
+    Paces GitHub requests against the budget reported in response headers.
+
+    Budgets are tracked per token and per rate-limit resource (``core``,
+    ``search``, ``graphql``), so a single governor can be shared by every
+    thread and client using the same tokens. ``acquire`` picks the token
+    with the most budget left and blocks only when needed:
+
+    - while a token has more than ``reserve_fraction`` of its limit left,
+      requests go out immediately;
+    - below that, requests are spaced so the remainder lasts until reset;
+    - an exhausted token waits for ``X-RateLimit-Reset`` unless another
+      token still has budget;
+    - ``pause`` (secondary rate limits) holds back every token.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[Optional[str]] = (None,),
+        reserve_fraction: float = DEFAULT_RESERVE_FRACTION,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.tokens: List[Optional[str]] = list(dict.fromkeys(tokens)) or [None]
+        self.reserve_fraction = reserve_fraction
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._budgets: Dict[Tuple[Optional[str], str], _Budget] = {}
+        self._paused_until = 0.0
+
+    def _budget(self, token: Optional[str], resource: str) -> _Budget:
+        key = (token, resource)
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = _Budget()
+        return budget
+
+    def _wait_locked(self, budget: _Budget, now: float, mono: float) -> float:
+        """Seconds ``budget`` must wait before its next request (0 if none)."""
+        if budget.remaining is None:
+            return 0.0
+        if budget.reset and now >= budget.reset:
+            # Window rolled over; the next response tells us the new budget.
+            budget.remaining = None
+            budget.next_at = 0.0
+            return 0.0
+        if budget.remaining <= 0:
+            return budget.reset - now + RESET_MARGIN
+        reserve = max(1, int((budget.limit or 0) * self.reserve_fraction))
+        if budget.remaining > reserve:
+            return 0.0
+        return max(0.0, budget.next_at - mono)
+
+    def acquire(self, resource: str = "core") -> Optional[str]:
+        """Block until a request may be sent and return the token to send it with."""
+        while True:
+            with self._lock:
+                now, mono = self._clock(), time.monotonic()
+                wait = self._paused_until - mono
+                if wait <= 0:
+                    best: Optional[Tuple[float, float, int]] = None
+                    for index, token in enumerate(self.tokens):
+                        budget = self._budget(token, resource)
+                        token_wait = self._wait_locked(budget, now, mono)
+                        left = float("inf") if budget.remaining is None else budget.remaining
+                        candidate = (token_wait, -left, index)
+                        if best is None or candidate < best:
+                            best = candidate
+                    assert best is not None
+                    wait, _, index = best
+                    if wait <= 0:
+                        token = self.tokens[index]
+                        budget = self._budget(token, resource)
+                        if budget.remaining is not None:
+                            # Count in-flight requests before their headers arrive.
+                            budget.remaining -= 1
+                            if budget.remaining > 0:
+                                budget.next_at = mono + max(0.0, budget.reset - now) / budget.remaining
+                        return token
+            self._sleep(wait)
+
+    def update(self, token: Optional[str], headers: Mapping[str, str], resource: str = "core") -> None:
+        """Record the budget reported by a response's ``X-RateLimit-*`` headers."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None or not remaining.isdigit():
+            return
+        resource = headers.get("X-RateLimit-Resource") or resource
+        reset = headers.get("X-RateLimit-Reset")
+        limit = headers.get("X-RateLimit-Limit")
+        with self._lock:
+            budget = self._budget(token, resource)
+            new_reset = float(reset) if reset and reset.isdigit() else budget.reset
+            if budget.remaining is None or new_reset > budget.reset:
+                budget.remaining = int(remaining)
+                budget.reset = new_reset
+            elif new_reset == budget.reset:
+                # Responses of concurrent requests arrive out of order, and the
+                # local count already includes requests still in flight.
+                budget.remaining = min(budget.remaining, int(remaining))
+            if limit and limit.isdigit():
+                budget.limit = int(limit)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for ``seconds`` (secondary rate limits)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
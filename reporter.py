@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO
 
 from .demand_extractor import DemandAnalysis
 
@@ -73,6 +75,41 @@ def _format_roadmap(roadmap: List[Dict[str, Any]]) -> str:
     return "\n\n".join(lines)
 
 
+# Report sections in output order, keyed by the analysis JSON field they render.
+REPORT_SECTIONS = ("overview", "pain_points", "merged_feature_requests", "roadmap")
+
+_SECTION_TITLES = {
+    "pain_points": "Top User Pain Points",
+    "merged_feature_requests": "Feature Requests (Merged)",
+    "roadmap": "Suggested Roadmap",
+}
+_SECTION_FORMATTERS = {
+    "overview": _format_overview,
+    "pain_points": _format_pain_points,
+    "merged_feature_requests": _format_feature_requests,
+    "roadmap": _format_roadmap,
+}
+
+
+def render_report_section(
+    name: str,
+    items: List[Any],
+    repo_url: str,
+    issue_count: int,
+) -> str:
+    """Render one report section (heading included) from its analysis JSON list."""
+    body = _SECTION_FORMATTERS[name](items)
+    if name == "overview":
+        return (
+            f"## Overview\n\n"
+            f"- **Repository**: {repo_url}\n"
+            f"- **Analyzed Issues**: {issue_count}\n"
+            f"\n"
+            f"{body}"
+        )
+    return f"## {_SECTION_TITLES[name]}\n\n{body}"
+
+
 def render_markdown_report(
     repo_url: str,
     issue_count: int,
@@ -81,22 +118,77 @@ def render_markdown_report(
     """
     Turn the structured DemandAnalysis into a human-readable Markdown report.
     """
-    overview_md = _format_overview(analysis.raw_overview)
-    pain_points_md = _format_pain_points(analysis.pain_points)
-    features_md = _format_feature_requests(analysis.merged_feature_requests)
-    roadmap_md = _format_roadmap(analysis.roadmap)
-
+    sections = {
+        "overview": analysis.raw_overview,
+        "pain_points": analysis.pain_points,
+        "merged_feature_requests": analysis.merged_feature_requests,
+        "roadmap": analysis.roadmap,
+    }
     return (
-        f"## Overview\n\n"
-        f"- **Repository**: {repo_url}\n"
-        f"- **Analyzed Issues**: {issue_count}\n"
-        f"\n"
-        f"{overview_md}\n\n"
-        f"## Top User Pain Points\n\n"
-        f"{pain_points_md}\n\n"
-        f"## Feature Requests (Merged)\n\n"
-        f"{features_md}\n\n"
-        f"## Suggested Roadmap\n\n"
-        f"{roadmap_md}\n"
+        "\n\n".join(
+            render_report_section(name, sections[name], repo_url, issue_count)
+            for name in REPORT_SECTIONS
+        )
+        + "\n"
     )
 
+
+class StreamingReportWriter:
+    """
+    Write report sections to ``path`` as soon as the analysis produces them.
+
+    Sections are written in report order and flushed one by one, so a
+    section that arrives early waits for the ones before it. ``finish``
+    completes the file from the final analysis and rewrites it if what was
+    streamed differs from the full rendering, so the end result always
+    matches ``render_markdown_report``.
+    """
+
+    def __init__(self, path: Path, repo_url: str, issue_count: Callable[[], int]) -> None:
+        self.path = path
+        self.repo_url = repo_url
+        # Called when the first section is written; the count is final by then.
+        self._issue_count = issue_count
+        self._count: Optional[int] = None
+        self._ready: Dict[str, List[Any]] = {}
+        self._written: List[str] = []
+        self._parts: List[str] = []
+        self._fh: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def add_section(self, name: str, items: List[Any]) -> List[str]:
+        """Queue a finished section and return the names of sections written now."""
+        if name not in _SECTION_FORMATTERS:
+            return []
+        with self._lock:
+            self._ready.setdefault(name, items)
+            flushed: List[str] = []
+            for section in REPORT_SECTIONS[len(self._written) :]:
+                if section not in self._ready:
+                    break
+                self._write(section, self._ready[section])
+                flushed.append(section)
+            return flushed
+
+    def _write(self, name: str, items: List[Any]) -> None:
+        if self._fh is None:
+            self._count = self._issue_count()
+            self._fh = self.path.open("w", encoding="utf-8")
+        separator = "\n\n" if self._written else ""
+        part = separator + render_report_section(name, items, self.repo_url, self._count)
+        self._fh.write(part)
+        self._fh.flush()
+        self._parts.append(part)
+        self._written.append(name)
+
+    def finish(self, analysis: DemandAnalysis, issue_count: int) -> None:
+        final = render_markdown_report(self.repo_url, issue_count, analysis)
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self._parts and "".join(self._parts) + "\n" == final:
+                with self.path.open("a", encoding="utf-8") as fh:
+                    fh.write("\n")
+                return
+            self.path.write_text(final, encoding="utf-8")
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import atexit
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+
+# The repository root is the ``demandlens`` package. When it is not installed
+# (running ``python -m pytest`` straight from a checkout), expose it under
+# that name through a symlink; PYTHONPATH carries it into subprocesses too.
+if importlib.util.find_spec("demandlens") is None:
+    _site = tempfile.mkdtemp(prefix="demandlens-tests-")
+    atexit.register(shutil.rmtree, _site, ignore_errors=True)
+    os.symlink(Path(__file__).resolve().parent.parent, Path(_site) / "demandlens", target_is_directory=True)
+    sys.path.insert(0, _site)
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [_site, os.environ.get("PYTHONPATH")]))
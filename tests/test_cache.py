@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from demandlens.benchmarks.stubs import StubGitHubServer
+from demandlens.cache import DiskCache
+from demandlens.github_client import GitHubClient
+from demandlens.metrics import Metrics
+
+
+def _cache_files_bytes(cache: DiskCache) -> int:
+    return sum(path.stat().st_size for path in cache.directory.glob("*/*.json"))
+
+
+def test_not_modified_replays_the_cached_body(tmp_path):
+    cache = DiskCache(tmp_path / "http")
+    with StubGitHubServer(issue_count=30) as github:
+        first = GitHubClient(base_url=github.base_url, cache=cache)
+        fetched = first.fetch_comments_for_issues("o", "r", first.list_issues("o", "r", max_issues=None))
+        sent = github.requests
+        assert github.not_modified == 0
+
+        metrics = Metrics()
+        second = GitHubClient(base_url=github.base_url, cache=cache, metrics=metrics)
+        replayed = second.fetch_comments_for_issues("o", "r", second.list_issues("o", "r", max_issues=None))
+
+    assert replayed == fetched
+    # Every request of the second run was revalidated and answered with an empty 304.
+    assert github.not_modified == github.requests - sent > 0
+    assert metrics.count("github_cache_hits_total") == github.not_modified
+
+
+def test_eviction_keeps_the_cache_under_max_bytes(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=4000)
+    for index in range(50):
+        cache.set(DiskCache.make_key(index), {"index": index, "body": "x" * 200})
+        # Keep entry 0 in use; least recently used entries go first.
+        assert cache.get(DiskCache.make_key(0)) is not None
+        assert _cache_files_bytes(cache) <= 4000
+
+    assert cache.get(DiskCache.make_key(1)) is None
+    assert cache.get(DiskCache.make_key(49)) == {"index": 49, "body": "x" * 200}
+
+    # A reopened cache rebuilds its index from the files and keeps to the bound.
+    reopened = DiskCache(tmp_path, max_bytes=2000)
+    reopened.set(DiskCache.make_key("new"), {"body": "y" * 200})
+    assert _cache_files_bytes(reopened) <= 2000
+    assert reopened.get(DiskCache.make_key("new")) is not None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from demandlens.github_graphql import GitHubGraphQLClient
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class _Response:
+    def __init__(self, payload: Any = None, status_code: int = 200, text: str = "") -> None:
+        self.status_code = status_code
+        self.text = text or json.dumps(payload)
+        self._payload = payload
+
+    def json(self) -> Any:
+        return self._payload
+
+
+class _Replay:
+    """Stands in for ``GitHubClient._send``: returns the queued responses in order."""
+
+    def __init__(self, *responses: _Response) -> None:
+        self.responses = list(responses)
+        self.variables: List[Dict[str, Any]] = []
+
+    def __call__(self, method: str, url: str, resource: str = "core", **kwargs: Any) -> _Response:
+        assert (method, resource) == ("POST", "graphql")
+        assert url.endswith("/graphql")
+        self.variables.append(kwargs["json"]["variables"])
+        return self.responses.pop(0)
+
+
+def _fixture(name: str) -> _Response:
+    return _Response(json.loads((FIXTURES / name).read_text(encoding="utf-8")))
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, *responses: _Response) -> tuple[GitHubGraphQLClient, _Replay]:
+    client = GitHubGraphQLClient(token="t", page_size=2)
+    replay = _Replay(*responses)
+    monkeypatch.setattr(client, "_send", replay)
+    return client, replay
+
+
+def test_follows_issue_cursors(monkeypatch):
+    client, replay = _client(
+        monkeypatch, _fixture("graphql_issues_page1.json"), _fixture("graphql_issues_page2.json")
+    )
+    pages = list(client.iter_issue_pages("octo-org", "widgets", max_issues=None))
+
+    assert [[issue.number for issue in page] for page in pages] == [[12, 11], [10]]
+    assert replay.variables[0]["after"] is None
+    assert replay.variables[1]["after"] == "Y3Vyc29yOnYyOpK5MjAyNi0wOS0zMFQxMDoxNTowMCswMDowMM4AAAAM"
+    assert not replay.responses
+
+    first = pages[0][0]
+    assert (first.state, first.user, first.comment_count) == ("open", "alice", 3)
+    assert first.labels == ["enhancement", "export"]
+    assert first.reaction_count == 7
+    assert [c.id for c in first.comments] == [9100000001, 9100000002]
+    assert pages[1][0].user is None
+
+
+def test_stops_at_max_issues(monkeypatch):
+    client, replay = _client(monkeypatch, _fixture("graphql_issues_page1.json"))
+    issues = client.list_issues("octo-org", "widgets", max_issues=2)
+
+    assert [issue.number for issue in issues] == [12, 11]
+    assert replay.variables[0]["first"] == 2
+
+
+def test_backfills_only_truncated_threads(monkeypatch):
+    client, replay = _client(
+        monkeypatch,
+        _fixture("graphql_issues_page1.json"),
+        _fixture("graphql_issues_page2.json"),
+        _fixture("graphql_comments_12.json"),
+    )
+    issues = [issue for page in client.iter_issue_pages("octo-org", "widgets", max_issues=None) for issue in page]
+    client.fetch_comments_for_issues("octo-org", "widgets", issues)
+
+    # Only #12 was cut off; its thread resumes after the listed comments.
+    assert len(replay.variables) == 3
+    assert replay.variables[2] == {
+        "owner": "octo-org",
+        "repo": "widgets",
+        "number": 12,
+        "after": "Y3Vyc29yOnYyOpHOAAAAAg==",
+    }
+    by_number = {issue.number: issue for issue in issues}
+    assert [c.id for c in by_number[12].comments] == [9100000001, 9100000002, 9100000004]
+    assert by_number[11].comments == []
+    assert [c.user for c in by_number[10].comments] == ["erin"]
+
+
+def test_graphql_errors_raise(monkeypatch):
+    client, _ = _client(monkeypatch, _fixture("graphql_errors.json"))
+    with pytest.raises(RuntimeError, match="Could not resolve to a Repository"):
+        client.list_issues("octo-org", "missing")
+
+
+def test_http_errors_raise(monkeypatch):
+    client, _ = _client(monkeypatch, _Response(status_code=502, text="Bad Gateway"))
+    with pytest.raises(RuntimeError, match="GitHub GraphQL error 502"):
+        client.list_issues("octo-org", "widgets")
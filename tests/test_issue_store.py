@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from demandlens.github_client import Issue, IssueComment
+from demandlens.github_graphql import GitHubGraphQLClient
+from demandlens.issue_store import IssueStore, _listing_bounds, sync_repository
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class _Response:
+    def __init__(self, payload: Any) -> None:
+        self.status_code = 200
+        self.text = json.dumps(payload)
+        self.headers: dict = {}
+        self.links: dict = {}
+        self._payload = payload
+
+    def json(self) -> Any:
+        return self._payload
+
+
+class _GitHub:
+    """Stands in for ``GitHubClient._send``: GraphQL posts replay fixtures, REST gets return []."""
+
+    def __init__(self, *fixtures: str) -> None:
+        self.fixtures = list(fixtures)
+
+    def __call__(self, method: str, url: str, resource: str = "core", **kwargs: Any) -> _Response:
+        if method == "GET":
+            return _Response([])
+        name = self.fixtures.pop(0)
+        return _Response(json.loads((FIXTURES / name).read_text(encoding="utf-8")))
+
+
+def test_incremental_sync_refetches_stale_graphql_threads_in_full(tmp_path, monkeypatch):
+    store = IssueStore(str(tmp_path / "issues.db"))
+    issue = Issue(id=2400000012, number=12, title="Export results as CSV", body="", state="open", html_url="")
+    store.upsert_issues("octo-org", "widgets", [issue])
+    # Four comments stored earlier; one has since been deleted on GitHub (count 3).
+    store.upsert_comments(
+        "octo-org",
+        "widgets",
+        {12: [IssueComment(id=i, body="", user=None) for i in (9100000001, 9100000002, 9100000004, 9100000009)]},
+    )
+    store.set_last_synced("octo-org", "widgets", "2026-09-01T00:00:00Z", listing=_listing_bounds("open", 100, None))
+
+    client = GitHubGraphQLClient(token="t", page_size=2)
+    github = _GitHub("graphql_issues_page1.json", "graphql_issues_page2.json", "graphql_comments_12.json")
+    monkeypatch.setattr(client, "_send", github)
+    sync_repository(client, store, "octo-org", "widgets")
+
+    assert not github.fixtures
+    issues = {i.number: i for i in store.load_issues("octo-org", "widgets", max_issues=None)}
+    # The listed comments of #12 are kept and the continuation is appended after them.
+    assert [c.id for c in issues[12].comments] == [9100000001, 9100000002, 9100000004]
+    assert [c.id for c in issues[10].comments] == [9100000003]
+    assert issues[11].comments == []
+    store.close()
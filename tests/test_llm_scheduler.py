@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import openai
+import pytest
+
+from demandlens.benchmarks.stubs import StubOpenAIServer
+from demandlens.llm import LLMClient
+from demandlens.llm_scheduler import LLMScheduler
+
+
+@pytest.fixture
+def openai_stub():
+    with StubOpenAIServer() as server:
+        yield server
+
+
+def _scheduler(server: StubOpenAIServer, max_retries: int) -> LLMScheduler:
+    llm = LLMClient(api_key="test", base_url=server.base_url, max_retries=0)
+    return LLMScheduler(llm, max_retries=max_retries, base_delay=0.01)
+
+
+def test_retries_transient_errors(openai_stub):
+    openai_stub.failures = 2
+    reply = _scheduler(openai_stub, max_retries=3).chat("system", "user")
+    assert reply == openai_stub.reply
+    assert openai_stub.requests == 3
+
+
+def test_gives_up_after_max_retries_without_sdk_retries(openai_stub):
+    openai_stub.failures = 10
+    with pytest.raises(openai.InternalServerError):
+        _scheduler(openai_stub, max_retries=2).chat("system", "user")
+    # One attempt per scheduler try: the SDK adds none of its own.
+    assert openai_stub.requests == 3
+
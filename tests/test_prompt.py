@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from demandlens.benchmarks.stubs import StubOpenAIServer
+from demandlens.benchmarks.synthetic import make_analysis, make_issues
+from demandlens.demand_extractor import DemandExtractor
+from demandlens.issue_parser import bulk_issues_to_text
+from demandlens.llm import LLMClient
+from demandlens.prompt import PROMPT_PREFIXES, SYSTEM_PROMPT, _OUTPUT_SPEC
+from demandlens.tokens import CHARS_PER_TOKEN
+
+
+def test_every_request_starts_with_a_fixed_prefix():
+    texts = bulk_issues_to_text(make_issues(120))
+    with StubOpenAIServer() as openai_stub:
+        llm = LLMClient(api_key="test", base_url=openai_stub.base_url)
+        extractor = DemandExtractor(llm, chunk_tokens=8000, max_workers=2)
+        extractor.analyze(texts)
+        extractor.analyze(texts[:5], previous=make_analysis(10))
+        extractor.analyze(texts[-40:], previous=make_analysis(10))
+        requests = openai_stub.messages
+
+    kinds = set()
+    for messages in requests:
+        assert messages[0]["content"] == SYSTEM_PROMPT
+        user = messages[-1]["content"]
+        kind = next((k for k, prefix in PROMPT_PREFIXES.items() if user.startswith(prefix)), None)
+        assert kind is not None, user[:200]
+        kinds.add(kind)
+    # Chunked and delta runs together use every prompt kind.
+    assert kinds == set(PROMPT_PREFIXES)
+
+
+def test_shared_prefix_reaches_the_cache_minimum():
+    # Every call starts with the system prompt and the schema. OpenAI caches prefixes of
+    # 1024 tokens or more; English prose runs closer to 4.5 characters per token than
+    # CHARS_PER_TOKEN, so keep a margin over the estimate.
+    shared_chars = len(SYSTEM_PROMPT) + len(_OUTPUT_SPEC)
+    assert shared_chars >= 1024 * CHARS_PER_TOKEN * 1.25
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Same as ``python -m <module> --help``, then reports which heavy dependencies got imported.
+_PROBE = """
+import json, runpy, sys
+sys.argv = ["{module}", "--help"]
+try:
+    runpy.run_module("{module}", run_name="__main__", alter_sys=True)
+except SystemExit:
+    pass
+print(json.dumps([m for m in ("openai", "requests", "tqdm") if m in sys.modules]))
+"""
+
+
+@pytest.mark.parametrize("module", ["demandlens.cli", "demandlens.batch"])
+def test_help_skips_heavy_imports(module):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert "usage:" in out.stdout
+    assert json.loads(out.stdout.splitlines()[-1]) == []
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from demandlens.benchmarks.stubs import StubOpenAIServer
+from demandlens.benchmarks.synthetic import make_issues
+from demandlens.demand_extractor import DemandExtractor
+from demandlens.issue_parser import bulk_issues_to_text
+from demandlens.llm import LLMClient
+from demandlens.llm_scheduler import LLMScheduler
+from demandlens.metrics import Metrics
+from demandlens.reporter import REPORT_SECTIONS, StreamingReportWriter, render_markdown_report
+
+
+REPO_URL = "https://github.com/octo-org/widgets"
+
+
+def _extractor(server: StubOpenAIServer, metrics: Metrics) -> DemandExtractor:
+    llm = LLMClient(api_key="test", base_url=server.base_url, max_retries=0, metrics=metrics)
+    return DemandExtractor(llm, scheduler=LLMScheduler(llm))
+
+
+def test_streamed_report_matches_the_full_rendering(tmp_path):
+    texts = bulk_issues_to_text(make_issues(20))
+    path = tmp_path / "report.md"
+    flushed = []
+    metrics = Metrics()
+    with StubOpenAIServer(stream_chunk_chars=16) as openai_stub:
+        extractor = _extractor(openai_stub, metrics)
+        writer = StreamingReportWriter(path, REPO_URL, issue_count=lambda: extractor.last_pack.issue_count)
+
+        def on_section(name, items):
+            flushed.extend(writer.add_section(name, items))
+
+        analysis = extractor.analyze(texts, on_section=on_section)
+        streamed = path.read_text(encoding="utf-8")
+        writer.finish(analysis, extractor.last_pack.issue_count)
+
+        expected = render_markdown_report(REPO_URL, len(texts), _extractor(openai_stub, Metrics()).analyze(texts))
+
+    # Every section went out while the completion was streaming, in report order.
+    assert flushed == list(REPORT_SECTIONS)
+    assert streamed and expected.startswith(streamed)
+    assert path.read_text(encoding="utf-8") == expected
+    assert metrics.count("llm_requests_total") == 1
+    assert metrics.count("llm_prompt_tokens_total") > 0
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from .issue_parser import IssueText
+
+
+# Average characters per token for English-heavy GitHub text when no
+# tokenizer is installed.
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> Any:
+    """Return a tiktoken encoding if the optional dependency is installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:  # pragma: no cover - unknown encoding / offline
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, otherwise estimate from length."""
+    if not text:
+        return 0
+    enc = _encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the head of ``text`` that fits in ``max_tokens``."""
+    if max_tokens <= 0:
+        return ""
+    enc = _encoding()
+    if enc is not None:
+        ids = enc.encode(text, disallowed_special=())
+        return text if len(ids) <= max_tokens else enc.decode(ids[:max_tokens])
+    return text[: max_tokens * CHARS_PER_TOKEN]
+
+
+def fit_issue_block(issue: IssueText, max_tokens: Optional[int]) -> Tuple[str, int]:
+    """
+    Render ``issue`` as a prompt block of at most ~``max_tokens`` tokens.
+
+    Content is kept by priority: the header (number, title, state, URL),
+    then the head of the body, then the most recent comments. Returns the
+    block and the number of tokens dropped.
+    """
+    block = issue.to_prompt_block()
+    full = estimate_tokens(block)
+    if max_tokens is None or full <= max_tokens:
+        return block, 0
+
+    header_cost = estimate_tokens(dataclasses.replace(issue, body="", comments=[]).to_prompt_block())
+    remaining = max(0, max_tokens - header_cost)
+
+    comment_costs = [estimate_tokens(c) for c in issue.comments]
+    body_cost = estimate_tokens(issue.body)
+    # The body head comes first, but leave comments up to half of what is left.
+    body_budget = max(remaining // 2, remaining - sum(comment_costs))
+    body = issue.body
+    if body_cost > body_budget:
+        body = truncate_to_tokens(issue.body, body_budget) + "\n[... body truncated ...]"
+        body_cost = body_budget
+    remaining -= min(body_cost, remaining)
+
+    kept: List[str] = []
+    for comment, cost in zip(reversed(issue.comments), reversed(comment_costs)):
+        if cost > remaining:
+            break
+        kept.append(comment)
+        remaining -= cost
+    kept.reverse()
+    omitted = len(issue.comments) - len(kept)
+    if omitted:
+        kept.insert(0, f"[{omitted} earlier comment(s) omitted]")
+
+    block = dataclasses.replace(issue, body=body, comments=kept).to_prompt_block()
+    return block, max(0, full - estimate_tokens(block))
+
+
+def pack_blocks(blocks: List[str], budget: int, min_size: int = 1) -> List[List[str]]:
+    """Greedily group consecutive blocks so each group stays within ``budget`` tokens."""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for block in blocks:
+        cost = estimate_tokens(block)
+        if current and used + cost > budget and len(current) >= min_size:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(block)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+@dataclass
+class PackStats:
+    """Token accounting for one analysis run."""
+
+    issue_count: int = 0
+    chunk_count: int = 0
+    total_tokens: int = 0
+    dropped_tokens: int = 0
+    truncated_issues: int = 0
+
+
+class ChunkPacker:
+    """
+    Incrementally render, truncate and pack issues into prompt-sized chunks.
+
+    ``add`` returns a chunk as soon as the next issue would overflow it, so
+    callers can start analyzing while issues are still arriving. No single
+    issue may exceed the chunk budget, so ``chunk_tokens`` also caps each
+    issue when it is smaller than ``max_issue_tokens``.
+    """
+
+    def __init__(
+        self,
+        chunk_tokens: Optional[int] = None,
+        max_issue_tokens: Optional[int] = None,
+    ) -> None:
+        self.chunk_tokens = chunk_tokens
+        caps = [c for c in (chunk_tokens, max_issue_tokens) if c]
+        self.issue_cap = min(caps) if caps else None
+        self.stats = PackStats()
+        self._current: List[str] = []
+        self._used = 0
+
+    def add(self, issue: IssueText) -> Optional[List[str]]:
+        block, lost = fit_issue_block(issue, self.issue_cap)
+        cost = estimate_tokens(block)
+        self.stats.issue_count += 1
+        self.stats.total_tokens += cost
+        if lost:
+            self.stats.dropped_tokens += lost
+            self.stats.truncated_issues += 1
+
+        full: Optional[List[str]] = None
+        if self.chunk_tokens and self._current and self._used + cost > self.chunk_tokens:
+            full = self._take()
+        self._current.append(block)
+        self._used += cost
+        return full
+
+    def flush(self) -> Optional[List[str]]:
+        """Return the last, partially filled chunk (if any)."""
+        return self._take() if self._current else None
+
+    def _take(self) -> List[str]:
+        chunk, self._current, self._used = self._current, [], 0
+        self.stats.chunk_count += 1
+        return chunk